@@ -12,7 +12,9 @@
  * @ingroup calculate
  */
 
+#include <algorithm>
 #include <iostream>
+#include <limits>
 #include <numeric>
 
 #include "utils/helper.h"
@@ -43,6 +45,77 @@ struct PCAResult {
 	std::vector<double> stdevs;
 };
 
+/**
+ * @ingroup pca
+ * The number of standard deviations either side of zero which
+ * are covered by the 8-bit range when quantizing principal
+ * component outputs. Values outside this range are clipped.
+ */
+constexpr double QUANTIZE_STDEVS = 4.0;
+
+/**
+ * @ingroup pca
+ * This function calculates the scale and offset used to quantize
+ * each output principal component to 8-bit unsigned integers.
+ *
+ * Because the input bands are centered and scaled before being
+ * projected, each principal component has a mean of zero and a 
+ * variance equal to its eigenvalue. This means the range of the
+ * output can be determined without an additional pass over the
+ * data. The range [-k * sqrt(eigenvalue), k * sqrt(eigenvalue)]
+ * is mapped linearly onto the values [1, 255], leaving 0 to be used
+ * as the no data value.
+ *
+ * The scale and offset are defined such that the original value
+ * can be recovered as value = offset + scale * quantized, which
+ * is the same definition GDAL uses for band scale and offset.
+ *
+ * @param PCAResult<T>& result
+ * @param int nComp
+ * @param std::vector<double>& scales
+ * @param std::vector<double>& offsets
+ */
+template <typename T>
+void
+getQuantizationParams(
+	PCAResult<T>& result,
+	int nComp,
+	std::vector<double>& scales,
+	std::vector<double>& offsets)
+{
+	scales.resize(nComp);
+	offsets.resize(nComp);
+	for (int c = 0; c < nComp; c++) {
+		double eigenvalue = static_cast<double>(result.eigenvalues[c]);
+		double range = QUANTIZE_STDEVS * std::sqrt(std::max(eigenvalue, std::numeric_limits<double>::min()));
+		scales[c] = (2 * range) / 254.0;
+		offsets[c] = -range - scales[c];
+	}
+}
+
+/**
+ * @ingroup pca
+ * This function quantizes a single principal component value to
+ * an 8-bit unsigned integer, using the scale and offset calculated
+ * by getQuantizationParams(). nan values are written as 0 (the no
+ * data value) and all other values are clipped to [1, 255].
+ *
+ * @param T val
+ * @param double scale
+ * @param double offset
+ * @returns uint8_t
+ */
+template <typename T>
+inline uint8_t
+quantizePixel(T val, double scale, double offset) {
+	if (std::isnan(val)) {
+		return 0;
+	}
+
+	double q = std::round((static_cast<double>(val) - offset) / scale);
+	return static_cast<uint8_t>(std::clamp(q, 1.0, 255.0));
+}
+
 /**
  * @ingroup pca
  * This function is used by the pca() function to calculate the principal component
@@ -314,7 +387,7 @@ calculatePCA(
 
 		retval.eigenvectors[i].resize(eigCols);
 		for (int64_t j = 0; j < eigCols; j++) {
-			retval.eigenvectors[i][j] = static_cast<T>(eigValBlock[i * eigCols + j]);
+			retval.eigenvectors[i][j] = static_cast<T>(eigVecBlock[i * eigCols + j]);
 		}
 	}
 	
@@ -352,6 +425,9 @@ calculatePCA(
  * for each output pixel and component. However, the linear kernel, which is
  * originally meant for fast machine learning use, does exactly what we need.
  *
+ * If quantize is true, the result is converted to 8-bit unsigned integers
+ * using the per-component scales and offsets before being written.
+ *
  * @param std::vector<RasterBandMetaData>& bands
  * @param std::vector<rasterBandMetaData>& PCABands
  * @param PCAResult<T>& result,
@@ -359,6 +435,9 @@ calculatePCA(
  * @param size_t size,
  * @param int height
  * @param int width
+ * @param bool quantize
+ * @param std::vector<double>& scales
+ * @param std::vector<double>& offsets
  */
 template <typename T>
 void 
@@ -369,7 +448,10 @@ writePCA(
 	GDALDataType type,
 	size_t size,
 	int height,
-	int width)
+	int width,
+	bool quantize,
+	std::vector<double>& scales,
+	std::vector<double>& offsets)
 {
 	int bandCount = static_cast<int>(bands.size());
 	int nComp = static_cast<int>(PCABands.size());
@@ -439,20 +521,50 @@ writePCA(
 	const T *p_result = valAcc.pull({0, height * width}).get_data();
 
 	//write the raw result to the output
-	for (int c = 0; c < nComp; c++) {
-		PCABands[c].p_band->RasterIO(
-			GF_Write,
-			0,
-			0,
-			width,
-			height,
-			(void *)((size_t)p_result + c * size),
-			width,
-			height,
-			type,
-			size * nComp,
-			size * nComp * width
-		);
+	if (!quantize) {
+		for (int c = 0; c < nComp; c++) {
+			PCABands[c].p_band->RasterIO(
+				GF_Write,
+				0,
+				0,
+				width,
+				height,
+				(void *)((size_t)p_result + c * size),
+				width,
+				height,
+				type,
+				size * nComp,
+				size * nComp * width
+			);
+		}
+	}
+	else {
+		//quantize the result to 8 bits, then write to the output
+		uint8_t *p_quant = reinterpret_cast<uint8_t *>(VSIMalloc3(nComp, height, width));
+		for (int i = 0; i < height * width; i++) {
+			int ci = i * nComp;
+			for (int c = 0; c < nComp; c++) {
+				p_quant[ci + c] = quantizePixel<T>(p_result[ci + c], scales[c], offsets[c]);
+			}
+		}
+
+		for (int c = 0; c < nComp; c++) {
+			PCABands[c].p_band->RasterIO(
+				GF_Write,
+				0,
+				0,
+				width,
+				height,
+				(void *)(p_quant + c),
+				width,
+				height,
+				GDT_Byte,
+				nComp,
+				nComp * width
+			);
+		}
+
+		VSIFree(p_quant);
 	}
 
 	VSIFree(p_data);
@@ -486,6 +598,9 @@ writePCA(
  * for each output pixel and component. However, the linear kernel, which is
  * originally meant for fast machine learning use, does exactly what we need.
  *
+ * If quantize is true, the result is converted to 8-bit unsigned integers
+ * using the per-component scales and offsets before being written.
+ *
  * @param std::vector<RasterBandMetaData>& bands
  * @param std::vector<RasterBandMetaData>& PCABands
  * @param PCAResult<T>& result
@@ -495,6 +610,9 @@ writePCA(
  * @param int yBlockSize
  * @param int xBlocks
  * @param int yBlocks
+ * @param bool quantize
+ * @param std::vector<double>& scales
+ * @param std::vector<double>& offsets
  */
 template <typename T>
 void 
@@ -507,7 +625,10 @@ writePCA(
 	int xBlockSize,
 	int yBlockSize,
 	int xBlocks,
-	int yBlocks)
+	int yBlocks,
+	bool quantize,
+	std::vector<double>& scales,
+	std::vector<double>& offsets)
 {
 	int bandCount = static_cast<int>(bands.size());
 	int nComp = static_cast<int>(PCABands.size());
@@ -519,6 +640,17 @@ writePCA(
 
 	T *p_data = reinterpret_cast<T *>(VSIMalloc3(xBlockSize * yBlockSize, size, bandCount));
 	T *p_comp = reinterpret_cast<T *>(VSIMalloc3(nComp, bandCount, size));
+	uint8_t *p_quant = quantize ?
+		reinterpret_cast<uint8_t *>(VSIMalloc3(xBlockSize * yBlockSize, nComp, sizeof(uint8_t))) :
+		nullptr;
+
+	//read result eigenvectors into matrix format
+	for (int c = 0; c < nComp; c++) {
+		int ci = c * bandCount;
+		for (int b = 0; b < bandCount; b++) {
+			p_comp[ci + b] = result.eigenvectors[c][b];
+		}
+	}
 
 	//create DAL homogen table wrappers for input data
 	const auto dataTable = DALHomogenTable(p_data, xBlockSize * yBlockSize, bandCount, [](const T*){}, oneapi::dal::data_layout::row_major);
@@ -576,26 +708,56 @@ writePCA(
 			const T *p_result = valAcc.pull({0, xBlockSize * yBlockSize}).get_data();
 
 			//write the raw result to the output
-			for (int c = 0; c < nComp; c++) {
-				PCABands[c].p_band->RasterIO(
-					GF_Write,
-					xBlock * xBlockSize,
-					yBlock * yBlockSize,
-					xValid,
-					yValid,
-					(void *)((size_t)p_comp + c * size),
-					xValid,
-					yValid,
-					type,
-					size * nComp,
-					size * nComp * xBlockSize
-				);
+			if (!quantize) {
+				for (int c = 0; c < nComp; c++) {
+					PCABands[c].p_band->RasterIO(
+						GF_Write,
+						xBlock * xBlockSize,
+						yBlock * yBlockSize,
+						xValid,
+						yValid,
+						(void *)((size_t)p_result + c * size),
+						xValid,
+						yValid,
+						type,
+						size * nComp,
+						size * nComp * xBlockSize
+					);
+				}
+			}
+			else {
+				//quantize the result to 8 bits, then write to the output
+				for (int i = 0; i < xBlockSize * yBlockSize; i++) {
+					int ci = i * nComp;
+					for (int c = 0; c < nComp; c++) {
+						p_quant[ci + c] = quantizePixel<T>(p_result[ci + c], scales[c], offsets[c]);
+					}
+				}
+
+				for (int c = 0; c < nComp; c++) {
+					PCABands[c].p_band->RasterIO(
+						GF_Write,
+						xBlock * xBlockSize,
+						yBlock * yBlockSize,
+						xValid,
+						yValid,
+						(void *)(p_quant + c),
+						xValid,
+						yValid,
+						GDT_Byte,
+						nComp,
+						nComp * xBlockSize
+					);
+				}
 			}
 		}
 	}
 
 	VSIFree(p_data);
 	VSIFree(p_comp);
+	if (p_quant) {
+		VSIFree(p_quant);
+	}
 }
 
 /**
@@ -623,6 +785,12 @@ writePCA(
  * scale, and project the input raster values to output pca bands which
  * are written to the output dataset.
  *
+ * If quantize is true, the output bands are 8-bit unsigned integers
+ * rather than floating point values. Each component is mapped onto
+ * the range [1, 255] using its eigenvalue, with 0 as the no data value,
+ * and the scale and offset are set on each output band so the original
+ * values may be recovered by GDAL-aware readers.
+ *
  * Finally, a GDALRasterWrapper is created using the output dataset,
  * and returned in a tuple alongside the eigenvectors and eigenvalues.
  *
@@ -632,6 +800,7 @@ writePCA(
  * @param std::string tempFolder
  * @param std::string filename
  * @param std::mape<std::string, std::string> driverOptions
+ * @param bool quantize
  * @returns std::tuple<
  *		GDALRasterWrapper *,
  *		std::vector<std::vector<double>>
@@ -651,7 +820,8 @@ pca(
 	bool largeRaster,
 	std::string tempFolder,
 	std::string filename,
-	std::map<std::string, std::string> driverOptions)
+	std::map<std::string, std::string> driverOptions,
+	bool quantize)
 {
 	GDALAllRegister();
 
@@ -684,14 +854,18 @@ pca(
 		}
 	}
 
+	GDALDataType outType = quantize ? GDT_Byte : type;
+	size_t outSize = quantize ? sizeof(uint8_t) : size;
+	double outNan = quantize ? 0 : std::nan("");
+
 	if (isMEMDataset) {
 		p_dataset = helper::createVirtualDataset("MEM", width, height, geotransform, projection);
 	
 		for (int i = 0; i < nComp; i++) {
-			pcaBands[i].type = type == GDT_Float64 ? GDT_Float64 : GDT_Float32;
-			pcaBands[i].size = type == GDT_Float64 ? sizeof(double) : sizeof(float);
+			pcaBands[i].type = outType;
+			pcaBands[i].size = outSize;
 			pcaBands[i].name = "comp_" + std::to_string(i + 1);
-			pcaBands[i].nan = std::nan("");
+			pcaBands[i].nan = outNan;
 			helper::addBandToMEMDataset(p_dataset, pcaBands[i]);
 		}
 	}
@@ -699,10 +873,10 @@ pca(
 		p_dataset = helper::createVirtualDataset("VRT", width, height, geotransform, projection);
 	
 		for (int i = 0; i < nComp; i++) {
-			pcaBands[i].type = type == GDT_Float64 ? GDT_Float64 : GDT_Float32;
-			pcaBands[i].size = type == GDT_Float64 ? sizeof(double) : sizeof(float);
+			pcaBands[i].type = outType;
+			pcaBands[i].size = outSize;
 			pcaBands[i].name = "comp_" + std::to_string(i + 1);
-			pcaBands[i].nan = std::nan("");
+			pcaBands[i].nan = outNan;
 			helper::createVRTBandDataset(p_dataset, pcaBands[i], tempFolder, pcaBands[i].name, VRTBandInfo, driverOptions);
 		}
 	}
@@ -722,10 +896,10 @@ pca(
 				yBlockSize != height;
 
 		for (int i = 0; i < nComp; i++) {
-			pcaBands[i].type = type == GDT_Float64 ? GDT_Float64 : GDT_Float32;
-			pcaBands[i].size = type == GDT_Float64 ? sizeof(double) : sizeof(float);
+			pcaBands[i].type = outType;
+			pcaBands[i].size = outSize;
 			pcaBands[i].name = "comp_" + std::to_string(i + 1);
-			pcaBands[i].nan = std::nan("");
+			pcaBands[i].nan = outNan;
 		
 			if (useTiles) {
 				pcaBands[i].xBlockSize = xBlockSize;
@@ -757,17 +931,27 @@ pca(
 	std::vector<double> means;
 	std::vector<double> stdevs;
 
+	//scale and offset of each output band, only used if the output is quantized
+	std::vector<double> scales;
+	std::vector<double> offsets;
+
 	//calculate PCA eigenvectors (and eigenvalues), and write values to PCA bands
 	switch(type) {
 		case GDT_Float32: {
 			PCAResult<float> result;
 			if (largeRaster) {
 				result = calculatePCA<float>(bands, type, size, xBlockSize, yBlockSize, xBlocks, yBlocks, nComp);
-				writePCA<float>(bands, pcaBands, result, type, size, xBlockSize, yBlockSize, xBlocks, yBlocks);
+				if (quantize) {
+					getQuantizationParams<float>(result, nComp, scales, offsets);
+				}
+				writePCA<float>(bands, pcaBands, result, type, size, xBlockSize, yBlockSize, xBlocks, yBlocks, quantize, scales, offsets);
 			}
 			else {
 				result = calculatePCA<float>(bands, type, size, width, height, nComp);
-				writePCA<float>(bands, pcaBands, result, type, size, height, width);
+				if (quantize) {
+					getQuantizationParams<float>(result, nComp, scales, offsets);
+				}
+				writePCA<float>(bands, pcaBands, result, type, size, height, width, quantize, scales, offsets);
 			}
 
 			eigenvectors.resize(result.eigenvectors.size());
@@ -792,11 +976,17 @@ pca(
 			PCAResult<double> result;
 			if (largeRaster) {
 				result = calculatePCA<double>(bands, type, size, xBlockSize, yBlockSize, xBlocks, yBlocks, nComp);
-				writePCA<double>(bands, pcaBands, result, type, size, xBlockSize, yBlockSize, xBlocks, yBlocks);
+				if (quantize) {
+					getQuantizationParams<double>(result, nComp, scales, offsets);
+				}
+				writePCA<double>(bands, pcaBands, result, type, size, xBlockSize, yBlockSize, xBlocks, yBlocks, quantize, scales, offsets);
 			}
 			else {
 				result = calculatePCA<double>(bands, type, size, width, height, nComp);
-				writePCA<double>(bands, pcaBands, result, type, size, height, width);
+				if (quantize) {
+					getQuantizationParams<double>(result, nComp, scales, offsets);
+				}
+				writePCA<double>(bands, pcaBands, result, type, size, height, width, quantize, scales, offsets);
 			}
 
 			eigenvectors = result.eigenvectors;
@@ -817,6 +1007,15 @@ pca(
 		}
 	}
 
+	//set the scale and offset so the quantized values can be converted back
+	if (quantize) {
+		for (int c = 0; c < nComp; c++) {
+			GDALRasterBand *p_band = p_dataset->GetRasterBand(c + 1);
+			p_band->SetScale(scales[c]);
+			p_band->SetOffset(offsets[c]);
+		}
+	}
+
 	std::vector<void *> buffers(nComp);
 	if (isMEMDataset) {
 		for (int c = 0; c < nComp; c++) {
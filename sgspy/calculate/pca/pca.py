@@ -16,6 +16,7 @@ import sys
 import site
 import tempfile
 from sgspy.utils import SpatialRaster
+from sgspy.utils.options import COMPRESS_OPTIONS, default_driver_options
 
 #ensure _sgs binary can be found
 site_packages = list(filter(lambda x : 'site-packages' in x, site.getsitepackages()))[0]
@@ -44,6 +45,19 @@ GIGABYTE = 1073741824
 # raster is both centered and scaled, then output values are calculated
 # for each principal component.
 # 
+# The compress parameter determines the compression used when writing to filename. By default
+# the output is written using 'zstd' compression (level 1) with a floating point predictor, or a
+# horizontal differencing predictor if dtype is 'uint8', and rasters which are small enough to be
+# processed in memory are also written as 512x512 tiles. If the GDAL build does not support ZSTD,
+# 'deflate' is used instead. The compression may also be set to 'deflate', 'lzw', or 'none'. Any
+# options given in driver_options take precedence over these defaults.
+# 
+# The dtype parameter may be set to 'uint8' to quantize the output
+# components to 8-bit unsigned integers, which is useful when the output
+# is only needed for visualization. Each component is mapped onto the values
+# 1 to 255 using its eigenvalue, 0 is used as the no data value, and the scale
+# and offset required to recover the original values are set on each band.
+# 
 # Examples
 # --------------------
 # rast = sgspy.SpatialRaster("raster.tif") @n
@@ -56,6 +70,9 @@ GIGABYTE = 1073741824
 # rast = sgspy.SpatialRaster("raster.tif") @n
 # pcomp = sgspy.calculate.pca(rast, 1, filename="pca.tif", driver_options={"COMPRESS": "LZW"}) 
 # 
+# rast = sgspy.SpatialRaster("raster.tif") @n
+# pcomp = sgspy.calculate.pca(rast, 3, filename="pca.tif", dtype="uint8")
+# 
 # Parameters
 # --------------------
 # rast : SpatialRaster @n
@@ -68,6 +85,10 @@ GIGABYTE = 1073741824
 #     whether to return the eigenvectors, eigenvalues, means, and stdevs with the SpatialRaster @n @n
 # driver_options : dict @n
 #    the creation options as defined by GDAL which will be passed when creating output files @n @n
+# dtype : str @n
+#     the output data type, either 'float' or 'uint8' @n @n
+# compress : str @n
+#     the compression to use when writing to filename, one of 'zstd', 'deflate', 'lzw', or 'none' @n @n
 # 
 # Returns
 # --------------------
@@ -77,7 +98,9 @@ def pca(
     num_comp: int,
     filename: str = '',
     return_metadata: bool = False,
-    driver_options: dict = None
+    driver_options: dict = None,
+    dtype: str = 'float',
+    compress: str = 'zstd'
     ):
         
     if type(rast) is not SpatialRaster:
@@ -96,6 +119,12 @@ def pca(
     if driver_options is not None and type(driver_options) is not dict: 
         raise TypeError("'driver_options' parameter, if given, must be of type dict.")
 
+    if type(dtype) is not str:
+        raise TypeError("'dtype' parameter must be of type str.")
+
+    if type(compress) is not str:
+        raise TypeError("'compress' parameter must be of type str.")
+
     if rast.closed:
         raise RuntimeError("the C++ object which the raster object wraps has been cleaned up and closed.")
 
@@ -108,6 +137,12 @@ def pca(
         msg = f"the number of components must be greater than zero and less than or equal to the total number of raster bands ({len(rast.bands)})."
         raise ValueError(msg)
 
+    if dtype not in ['float', 'uint8']:
+        raise ValueError("'dtype' parameter must be one of 'float' or 'uint8'.")
+
+    if compress not in COMPRESS_OPTIONS:
+        raise ValueError("'compress' parameter must be one of 'zstd', 'deflate', 'lzw', or 'none'.")
+
     #ensure driver options keys are string, and convert driver options vals to string
     driver_options_str = {}
     if driver_options:
@@ -130,6 +165,11 @@ def pca(
 
     large_raster = large_raster or (raster_size_bytes > GIGABYTE * 4)
 
+    #set default creation options for the output file, user given driver options take precedence
+    if filename != "":
+        predictor = 2 if dtype == 'uint8' else 3
+        driver_options_str = default_driver_options(compress, predictor, large_raster) | driver_options_str
+
     temp_dir = tempfile.mkdtemp()
     rast.have_temp_dir = True
     rast.temp_dir = temp_dir
@@ -140,7 +180,8 @@ def pca(
         large_raster,
         temp_dir,
         filename,
-        driver_options_str
+        driver_options_str,
+        dtype == 'uint8'
     )
 
     metadata = (eigenvectors, eigenvalues, means, stdevs)
@@ -70,6 +70,14 @@
 namespace py = pybind11;
 using namespace pybind11::literals;
 
+/**
+ * The stratification, sampling, and calculation functions below only operate on
+ * C++ and GDAL objects once their arguments have been converted, so they are bound with
+ * a call guard which releases the GIL for the duration of the call. This allows other
+ * Python threads to run while they execute. The arguments are converted before, and
+ * the return values after, the GIL is released.
+ */
+
 PYBIND11_MODULE(_sgs, m) {
 	// source code in sgspy/utils/raster.h
 	py::class_<sgs::raster::GDALRasterWrapper>(m, "GDALRasterWrapper")
@@ -107,7 +115,7 @@ PYBIND11_MODULE(_sgs, m) {
 		.def("get_points", &sgs::vector::GDALVectorWrapper::getPoints)
 		.def("get_wkt_points", &sgs::vector::GDALVectorWrapper::getPointsAsWkt)
 		.def("get_linestrings", &sgs::vector::GDALVectorWrapper::getLineStrings)
-		.def("write", &sgs::vector::GDALVectorWrapper::write)
+		.def("write", &sgs::vector::GDALVectorWrapper::write, py::call_guard<py::gil_scoped_release>())
 		.def("get_projection", &sgs::vector::GDALVectorWrapper::getFullProjectionInfo);
 
 	// source code in sgspy/utils/dist.h
@@ -116,10 +124,11 @@ PYBIND11_MODULE(_sgs, m) {
 		pybind11::arg("band"),
 		pybind11::arg("p_vector").none(true),
 		pybind11::arg("layer"),
-		pybind11::arg("nBuckets"));
+		pybind11::arg("nBuckets"),
+		py::call_guard<py::gil_scoped_release>());
 
 	// source code in sgspy/calculate/pca/pca.h
-	m.def("pca_cpp", &sgs::pca::pca);
+	m.def("pca_cpp", &sgs::pca::pca, py::call_guard<py::gil_scoped_release>());
 
 	// source code in sgspy/sample/clhs/clhs.h
 	m.def("clhs_cpp", &sgs::clhs::clhs,
@@ -134,7 +143,8 @@ PYBIND11_MODULE(_sgs, m) {
 		pybind11::arg("replace"),
 		pybind11::arg("plot"),
 		pybind11::arg("tempFolder"),
-		pybind11::arg("filename"));
+		pybind11::arg("filename"),
+		py::call_guard<py::gil_scoped_release>());
 
 	// source code in sgspy/sample/srs/srs.h
 	m.def("srs_cpp", &sgs::srs::srs, 
@@ -148,7 +158,8 @@ PYBIND11_MODULE(_sgs, m) {
 		pybind11::arg("buffOuter"),
 		pybind11::arg("plot"),
 		pybind11::arg("tempFolder"),
-		pybind11::arg("filename"));
+		pybind11::arg("filename"),
+		py::call_guard<py::gil_scoped_release>());
 
 	// source code in sgspy/sample/strat/strat.h
 	m.def("strat_cpp", &sgs::strat::strat,
@@ -173,7 +184,8 @@ PYBIND11_MODULE(_sgs, m) {
 		pybind11::arg("mapStratMapping"),
 		pybind11::arg("plot"),
 		pybind11::arg("filename"),
-		pybind11::arg("tempFolder"));
+		pybind11::arg("tempFolder"),
+		py::call_guard<py::gil_scoped_release>());
 
 	// source code in sgspy/sample/systematic/systematic.h
 	m.def("systematic_cpp", &sgs::systematic::systematic,
@@ -188,17 +200,18 @@ PYBIND11_MODULE(_sgs, m) {
 		pybind11::arg("buffOuter"),
 		pybind11::arg("force"),
 		pybind11::arg("plot"),
-		pybind11::arg("filename"));
+		pybind11::arg("filename"),
+		py::call_guard<py::gil_scoped_release>());
 
 	// source code in sgspy/stratify/breaks/breaks.h
-	m.def("breaks_cpp", &sgs::breaks::breaks);
+	m.def("breaks_cpp", &sgs::breaks::breaks, py::call_guard<py::gil_scoped_release>());
 
 	// source code in sgspy/stratify/map/map_stratifications.h
-	m.def("map_cpp", &sgs::map::map);
+	m.def("map_cpp", &sgs::map::map, py::call_guard<py::gil_scoped_release>());
 
 	// source code in sgspy/stratify/poly/poly.h
-	m.def("poly_cpp", &sgs::poly::poly);
+	m.def("poly_cpp", &sgs::poly::poly, py::call_guard<py::gil_scoped_release>());
 
 	// source code in sgspy/stratify/quantiles/quantiles.h
-	m.def("quantiles_cpp", &sgs::quantiles::quantiles);
+	m.def("quantiles_cpp", &sgs::quantiles::quantiles, py::call_guard<py::gil_scoped_release>());
 }
@@ -24,6 +24,51 @@
 namespace sgs {
 namespace breaks {
 
+/**
+ * @ingroup breaks
+ * The maximum number of breaks for which getStrata() uses a linear
+ * count rather than a binary search.
+ */
+constexpr size_t LINEAR_SEARCH_MAX_BREAKS = 16;
+
+/**
+ * @ingroup breaks
+ * This is a helper function for determining the strata of a (not nan)
+ * pixel value, given the sorted break values of its band.
+ *
+ * The strata is the number of break values which are strictly less than
+ * the pixel value. For example, if the value was 3 and the breaks vector
+ * was [2, 4, 6], the strata would be 1. This is equivalent to the index
+ * returned by std::lower_bound.
+ *
+ * For a small number of breaks, which is by far the most common case,
+ * the comparisons are simply counted. This avoids the unpredictable
+ * branches of a binary search, and the loop can be vectorized by the
+ * compiler. For a larger number of breaks, std::lower_bound is used.
+ *
+ * @param double val
+ * @param std::vector<double>& bandBreaks
+ * @returns size_t
+ */
+inline size_t
+getStrata(
+	double val,
+	std::vector<double>& bandBreaks)
+{
+	size_t nBreaks = bandBreaks.size();
+	if (nBreaks <= LINEAR_SEARCH_MAX_BREAKS) {
+		const double *p_breaks = bandBreaks.data();
+		size_t strat = 0;
+		for (size_t i = 0; i < nBreaks; i++) {
+			strat += static_cast<size_t>(val > p_breaks[i]);
+		}
+		return strat;
+	}
+
+	auto it = std::lower_bound(bandBreaks.begin(), bandBreaks.end(), val);
+	return std::distance(bandBreaks.begin(), it);
+}
+
 /**
  * @ingroup breaks
  * This is a helper function for processing a pixel of data
@@ -36,13 +81,12 @@ namespace breaks {
  * then the mapped raster (but not necessarily all output rasters)
  * is also nan at that pixel.
  *
- * Then, if it isn't a nan pixel the lower bound of the value 
- * within the vector of break values is found. For example,
- * if the value was 3 and the breaks vector was [2, 4, 6], the
- * lower bound would be 1, which is the index of 4, the first
- * value larger than 3 in the breaks vector. This lower bound
- * is the strata. This strata (or the nan value) is then written 
- * with the appropriate type to the strat raster band.
+ * Then, if it isn't a nan pixel the strata is determined using
+ * getStrata(). For example, if the value was 3 and the breaks 
+ * vector was [2, 4, 6], the strata would be 1, which is the index
+ * of 4, the first value larger than 3 in the breaks vector. This
+ * strata (or the nan value) is then written with the appropriate
+ * type to the strat raster band.
  *
  * @param size_t index
  * @param RasterBandMetaData& dataBand
@@ -69,11 +113,7 @@ inline void processMapPixel(
 	bool isNan = std::isnan(val) || (double)val == dataBand.nan;
 	mapNan |= isNan;
 		
-	size_t strat = 0;
-	if (!isNan) {
-		auto it = std::lower_bound(bandBreaks.begin(), bandBreaks.end(), val);
-		strat = (it == bandBreaks.end()) ? bandBreaks.size() : std::distance(bandBreaks.begin(), it);
-	}
+	size_t strat = isNan ? 0 : getStrata(val, bandBreaks);
 
 	helper::setStrataPixelDependingOnType(stratBand.type, p_stratBuffer, index, isNan, strat);
 
@@ -89,13 +129,12 @@ inline void processMapPixel(
  * First, the value is read in as a double, and it is determined
  * whether the pixel is a nan pixel or not.
  *
- * Then, if it isn't a nan pixel the lower bound of the value 
- * within the vector of break values is found. For example,
- * if the value was 3 and the breaks vector was [2, 4, 6], the
- * lower bound would be 1, which is the index of 4, the first
- * value larger than 3 in the breaks vector. This lower bound
- * is the strata. This strata (or the nan value) is then written 
- * with the appropriate type to the strat raster band.
+ * Then, if it isn't a nan pixel the strata is determined using
+ * getStrata(). For example, if the value was 3 and the breaks 
+ * vector was [2, 4, 6], the strata would be 1, which is the index
+ * of 4, the first value larger than 3 in the breaks vector. This
+ * strata (or the nan value) is then written with the appropriate
+ * type to the strat raster band.
  *
  * @param size_t index
  * @param void *p_data
@@ -116,11 +155,7 @@ processPixel(
 	double val = helper::getPixelValueDependingOnType<double>(p_dataBand->type, p_data, index);
 	bool isNan = std::isnan(val) || val == p_dataBand->nan;
 
-	size_t strat = 0;
-	if (!isNan) {
-		auto it = std::lower_bound(bandBreaks.begin(), bandBreaks.end(), val);
-		strat = (it == bandBreaks.end()) ? bandBreaks.size() : std::distance(bandBreaks.begin(), it);
-	}
+	size_t strat = isNan ? 0 : getStrata(val, bandBreaks);
 
 	helper::setStrataPixelDependingOnType(p_stratBand->type, p_strat, index, isNan, strat);
 }
@@ -200,6 +235,9 @@ processPixel(
  * as bands now that they are populated with data and are thus allowed
  * to be added. 
  *
+ * If an output file was written and overviews is true, overviews
+ * are built for the output dataset.
+ *
  * If the dataset output bands are fully in memory, they are moved to 
  * a vector from their metadata objects to be passed as a parameter
  * to the GDALRasterWrapper constructor (or not if the bands aren't in
@@ -213,6 +251,7 @@ processPixel(
  * @param int threads
  * @param std::string tempFolder
  * @param std::map<std::string, std::string> driverOptions
+ * @param bool overviews
  * @returns GDALRasterWrapper *
  */
 raster::GDALRasterWrapper *breaks(
@@ -223,7 +262,8 @@ raster::GDALRasterWrapper *breaks(
 	bool largeRaster,
 	int threads,
 	std::string tempFolder,
-	std::map<std::string, std::string> driverOptions)
+	std::map<std::string, std::string> driverOptions,
+	bool overviews)
 {
 	GDALAllRegister();
 
@@ -383,7 +423,6 @@ raster::GDALRasterWrapper *breaks(
 
 	//iterate through all pixels and update the stratified raster bands
 	if (largeRaster) {
-		pybind11::gil_scoped_acquire acquire;
 		boost::asio::thread_pool pool(threads);
 
 		if (map) {
@@ -577,7 +616,6 @@ raster::GDALRasterWrapper *breaks(
 			}
 		}
 		pool.join();
-		pybind11::gil_scoped_release release;
 	}
 	else {
 		size_t pixelCount = static_cast<size_t>(p_raster->getWidth()) * static_cast<size_t>(p_raster->getHeight());
@@ -656,6 +694,11 @@ raster::GDALRasterWrapper *breaks(
 		}
 	}
 
+	//build overviews for the output file
+	if (overviews && !isVRTDataset && !isMEMDataset) {
+		helper::buildOverviews(p_dataset, width, height);
+	}
+
 	//if the bands are in memory, populate a vector of just bands to use in GDALRasterWrapper creation
 	std::vector<void *> buffers(stratBands.size());
 	if (!largeRaster) {
@@ -21,6 +21,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 from sgspy.utils import SpatialRaster, StratRasterBandMetadata
+from sgspy.utils.options import COMPRESS_OPTIONS, default_driver_options
 
 #ensure _sgs binary can be found
 site_packages = list(filter(lambda x : 'site-packages' in x, site.getsitepackages()))[0]
@@ -29,6 +30,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from _sgs import breaks_cpp, dist_cpp
 
 GIGABYTE = 1073741824
+OVERVIEW_PIXEL_THRESHOLD = 4096 * 4096
 
 ##
 # @ingroup user_breaks
@@ -63,6 +65,18 @@ GIGABYTE = 1073741824
 # Note that if this parameter is given, but filename is not and the raster fits entirely in memory, the
 # driver_options parameter will be ignored.
 #
+# The compress parameter determines the compression used when writing to filename. Stratified
+# rasters contain small integer values, so they compress very well. By default the output is
+# written using 'zstd' compression (level 1) with a horizontal differencing predictor, and rasters which
+# are small enough to be processed in memory are also written as 512x512 tiles. If the GDAL build does
+# not support ZSTD, 'deflate' is used instead. The compression may also be set to 'deflate', 'lzw', or
+# 'none'. Any options given in driver_options take precedence over these defaults.
+#
+# The overviews parameter determines whether overviews are built for the output file after it
+# is written, which allows downsampled reads (for example when plotting) to avoid reading the full
+# resolution bands. If it is not given, overviews are built when a filename is given and the raster
+# is larger than 4096x4096 pixels. Overviews are never built if filename is not given.
+#
 # Additionally, the 'plot' parameter determines whether a histogram plot will be made of the
 # stratified bands. The histogram will be the distribution of each of the raster bands which
 # had stratified bands made from them, with indicators on the break values. The 'histogram_bins'
@@ -82,6 +96,9 @@ GIGABYTE = 1073741824
 # rast = sgspy.SpatialRaster("multi_band_rast.tif") @n
 # srast = sgspy.stratify.breaks(rast, breaks=[[3, 5, 11, 18], [40, 60, 80], [2, 5]], plot=True)
 # 
+# rast = sgspy.SpatialRaster("single_band_rast.tif") @n
+# srast = sgspy.stratify.breaks(rast, breaks=[20, 40, 60, 80], filename="breaks.tif", compress="none")
+# 
 # Parameters
 # --------------------
 # rast : SpatialRaster @n
@@ -100,6 +117,10 @@ GIGABYTE = 1073741824
 #     whether or not to plot a histogram of the values in the bands with indicators on the breaks @n @n
 # histogram_bins : Optional[int] @n
 #     The number of bins in the plotted histogram. @n @n
+# compress : str @n
+#     the compression to use when writing to filename, one of 'zstd', 'deflate', 'lzw', or 'none' @n @n
+# overviews : Optional[bool] @n
+#     whether to build overviews for the output file @n @n
 #
 # Returns
 # --------------------
@@ -112,7 +133,9 @@ def breaks(
     thread_count: int = 8,
     driver_options: dict = None,
     plot: Optional[bool] = False,
-    histogram_bins: Optional[int] = None
+    histogram_bins: Optional[int] = None,
+    compress: str = 'zstd',
+    overviews: Optional[bool] = None
     ):
 
     MAX_STRATA_VAL = 2147483647 #maximum value stored within a 32-bit signed integer to ensure no overflow
@@ -141,6 +164,12 @@ def breaks(
     if histogram_bins is not None and type(histogram_bins) is not int:
         raise TypeError("'histogram_bins' parameter, if given, must be of type int.")
 
+    if type(compress) is not str:
+        raise TypeError("'compress' parameter must be of type str.")
+
+    if overviews is not None and type(overviews) is not bool:
+        raise TypeError("'overviews' parameter, if given, must be of type bool.")
+
     if rast.closed:
             raise RuntimeError("the C++ object which the raster object wraps has been cleaned up and closed.")
 
@@ -195,6 +224,9 @@ def breaks(
     if thread_count < 1:
         raise ValueError("number of threads can't be less than 1.")
 
+    if compress not in COMPRESS_OPTIONS:
+        raise ValueError("'compress' parameter must be one of 'zstd', 'deflate', 'lzw', or 'none'.")
+
     #ensure driver options keys are string, and convert driver options vals to string
     driver_options_str = {}
     if driver_options:
@@ -217,6 +249,14 @@ def breaks(
     #if large_raster is true, the C++ function will process the raster in blocks
     large_raster = large_raster or (raster_size_bytes > GIGABYTE * 4)
 
+    #by default, only build overviews for output files of large images
+    if overviews is None:
+        overviews = filename != "" and height * width > OVERVIEW_PIXEL_THRESHOLD
+
+    #set default creation options for the output file, user given driver options take precedence
+    if filename != "":
+        driver_options_str = default_driver_options(compress, 2, large_raster) | driver_options_str
+
     #make a temp directory which will be deleted if there is any problem when calling the cpp function
     temp_dir = tempfile.mkdtemp()
     rast.have_temp_dir = True
@@ -231,7 +271,8 @@ def breaks(
         large_raster,
         thread_count,
         temp_dir,
-        driver_options_str
+        driver_options_str,
+        overviews
     ))
 
     #now that it's created, give the cpp raster object ownership of the temporary directory
@@ -693,6 +693,9 @@ processPixel(
  * bands now that they are populated with data and are thus allowed
  * to be added.
  *
+ * If an output file was written and overviews is true, overviews are
+ * built for the output dataset.
+ *
  * If the dataset output bands are fully in memory, they are moved to a
  * vector from their metadata objects to be passed as a parameter to the
  * GDALRasterWrapper constructor (or not if the bands aren't in memory). 
@@ -707,6 +710,7 @@ processPixel(
  * @param int threadCount
  * @param std::map<std::string, std::string> driverOptions,
  * @param double eps
+ * @param bool overviews
  * @returns GDALRasterWrapper *pointer to newly created stratified raster
  */
 std::pair<raster::GDALRasterWrapper *, std::unordered_map<std::string, std::vector<double>>>
@@ -719,7 +723,8 @@ quantiles(
 	bool largeRaster,
 	int threadCount,
 	std::map<std::string, std::string> driverOptions,
-	double eps) 
+	double eps,
+	bool overviews) 
 {
 	GDALAllRegister();
 
@@ -867,7 +872,6 @@ quantiles(
 
 	std::vector<std::vector<double>> quantiles(probabilities.size());
 	if (largeRaster) {
-		pybind11::gil_scoped_acquire acquire;
 		boost::asio::thread_pool pool(threadCount); 
 	
 		//initialize synchronization variables
@@ -1129,7 +1133,6 @@ quantiles(
 
 		pool.join();
 		VSIFree(quantilesCalculated);
-		pybind11::gil_scoped_release release;
 	}
 	else {
 		//call quantiles calculation fuction depending on type
@@ -1218,6 +1221,11 @@ quantiles(
 		}
 	}
 
+	//build overviews for the output file
+	if (overviews && !isVRTDataset && !isMEMDataset) {
+		helper::buildOverviews(p_dataset, width, height);
+	}
+
 	//if bands are in memory, populate a vector of just bands to use in GDALRasterWrapper creation
 	std::vector<void *> buffers(stratBands.size());
 	if (!largeRaster) {
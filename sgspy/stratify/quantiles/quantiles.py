@@ -21,6 +21,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from sgspy.utils import SpatialRaster, StratRasterBandMetadata
+from sgspy.utils.options import COMPRESS_OPTIONS, default_driver_options
 
 #ensure _sgs binary can be found
 site_packages = list(filter(lambda x : 'site-packages' in x, site.getsitepackages()))[0]
@@ -29,6 +30,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from _sgs import quantiles_cpp, dist_cpp
 
 GIGABYTE = 1073741824
+OVERVIEW_PIXEL_THRESHOLD = 4096 * 4096
 
 ##
 # @ingroup user_quantiles
@@ -77,6 +79,18 @@ GIGABYTE = 1073741824
 #     https://web.cs.ucla.edu/~weiwang/paper/SSDBM07_2.pdf
 #     https://www.intel.com/content/www/us/en/docs/onemkl/developer-reference-summary-statistics-notes/2021-1/computing-quantiles-with-vsl-ss-method-squants-zw.html
 #
+# The compress parameter determines the compression used when writing to filename. Stratified
+# rasters contain small integer values, so they compress very well. By default the output is
+# written using 'zstd' compression (level 1) with a horizontal differencing predictor, and rasters which
+# are small enough to be processed in memory are also written as 512x512 tiles. If the GDAL build does
+# not support ZSTD, 'deflate' is used instead. The compression may also be set to 'deflate', 'lzw', or
+# 'none'. Any options given in driver_options take precedence over these defaults.
+#
+# The overviews parameter determines whether overviews are built for the output file after it
+# is written, which allows downsampled reads (for example when plotting) to avoid reading the full
+# resolution bands. If it is not given, overviews are built when a filename is given and the raster
+# is larger than 4096x4096 pixels. Overviews are never built if filename is not given.
+#
 # Additionally, the 'plot' parameter determines whether a histogram plot will be made of the
 # stratified bands. The histogram will be the distribution of each of the raster bands which
 # had stratified bands made from them, with indicators on the break values. The 'histogram_bins'
@@ -120,6 +134,10 @@ GIGABYTE = 1073741824
 #     The number of bins in the plotted histogram. @n @n
 # info : Optional[bool] @n
 #     when true, plot quantile values of each band after calculation @n @n
+# compress : str @n
+#     the compression to use when writing to filename, one of 'zstd', 'deflate', 'lzw', or 'none' @n @n
+# overviews : Optional[bool] @n
+#     whether to build overviews for the output file @n @n
 # 
 # Returns
 # --------------------
@@ -134,7 +152,9 @@ def quantiles(
     eps: float = .001,
     plot: Optional[bool] = None,
     histogram_bins: Optional[int] = None,
-    info: Optional[bool] = None):
+    info: Optional[bool] = None,
+    compress: str = 'zstd',
+    overviews: Optional[bool] = None):
     
     MAX_STRATA_VAL = 2147483647 #maximum value stored within a 32-bit signed integer to ensure no overflow
     
@@ -171,6 +191,12 @@ def quantiles(
     if info is not None and type(info) is not bool:
         raise TypeError("'info' parameter, if given, must be of type bool.")
 
+    if type(compress) is not str:
+        raise TypeError("'compress' parameter must be of type str.")
+
+    if overviews is not None and type(overviews) is not bool:
+        raise TypeError("'overviews' parameter, if given, must be of type bool.")
+
     probabilities_dict = {}
     if type(quantiles) is int:
         #error check number of raster bands
@@ -256,6 +282,9 @@ def quantiles(
     if thread_count < 1:
         raise ValueError("number of threads can't be less than 1.")
 
+    if compress not in COMPRESS_OPTIONS:
+        raise ValueError("'compress' parameter must be one of 'zstd', 'deflate', 'lzw', or 'none'.")
+
     driver_options_str = {}
     if driver_options:
         for (key, val) in driver_options.items():
@@ -278,6 +307,14 @@ def quantiles(
     #if large_raster is true, the C++ function will process the raster in blocks
     large_raster = large_raster or (raster_size_bytes > GIGABYTE * 4)
 
+    #by default, only build overviews for output files of large images
+    if overviews is None:
+        overviews = filename != "" and height * width > OVERVIEW_PIXEL_THRESHOLD
+
+    #set default creation options for the output file, user given driver options take precedence
+    if filename != "":
+        driver_options_str = default_driver_options(compress, 2, large_raster) | driver_options_str
+
     #make a temp directory which will be deleted if there is any problem when calling the cpp function
     temp_dir = tempfile.mkdtemp()
     rast.have_temp_dir = True
@@ -293,7 +330,8 @@ def quantiles(
         large_raster,
         thread_count,
         driver_options_str,
-        eps
+        eps,
+        overviews
     )
 
     srast = SpatialRaster(srast)
@@ -408,6 +408,9 @@ dist(
 		case GDT_Int8: 
 			calculateDist<int8_t>(band, sampled, height, width, nBins, retval);
 			break;
+		case GDT_Byte: 
+			calculateDist<uint8_t>(band, sampled, height, width, nBins, retval);
+			break;
 		case GDT_UInt16: 
 			calculateDist<uint16_t>(band, sampled, height, width, nBins, retval);
 			break;
@@ -14,6 +14,7 @@
 
 #pragma once
 
+#include <cstring>
 #include <iostream>
 #include <filesystem>
 #include <mutex>
@@ -177,6 +178,8 @@ getPixelValueDependingOnType(
 	switch (type) {
 		case GDT_Int8:
 			return static_cast<T>(((int8_t *)p_data)[index]);
+		case GDT_Byte:
+			return static_cast<T>(((uint8_t *)p_data)[index]);
 		case GDT_UInt16:
 			return static_cast<T>(((uint16_t *)p_data)[index]);
 		case GDT_Int16:
@@ -359,6 +362,10 @@ createVirtualDataset(
  * including block sizes and GDALRasterBand pointers. The name
  * and nodata value of each band is also updated.
  *
+ * If ZSTD compression is requested but the driver was built without
+ * ZSTD support, DEFLATE is used instead and the ZSTD_LEVEL option
+ * is dropped.
+ *
  * @param std::string filename
  * @param std::string driverName
  * @param int width
@@ -394,12 +401,12 @@ createDataset(
 			papszOptions = CSLSetNameValue(papszOptions, "TILED", "YES");
 		}
 		if (driverOptions.find("BLOCKXSIZE") == driverOptions.end()) {
-			const char *xBlockSizeOption = std::to_string(bands[0].xBlockSize).c_str();
-			papszOptions = CSLSetNameValue(papszOptions, "BLOCKXSIZE", xBlockSizeOption);
+			std::string xBlockSizeOption = std::to_string(bands[0].xBlockSize);
+			papszOptions = CSLSetNameValue(papszOptions, "BLOCKXSIZE", xBlockSizeOption.c_str());
 		}
 		if (driverOptions.find("BLOCKYSIZE") == driverOptions.end()) {
-			const char *yBlockSizeOption = std::to_string(bands[0].yBlockSize).c_str();
-			papszOptions = CSLSetNameValue(papszOptions, "BLOCKYSIZE", yBlockSizeOption);
+			std::string yBlockSizeOption = std::to_string(bands[0].yBlockSize);
+			papszOptions = CSLSetNameValue(papszOptions, "BLOCKYSIZE", yBlockSizeOption.c_str());
 		}
 	}
 
@@ -407,6 +414,16 @@ createDataset(
 		papszOptions = CSLSetNameValue(papszOptions, key.c_str(), val.c_str());
 	}
 
+	//fall back to DEFLATE if this build of the driver does not support ZSTD
+	const char *compress = CSLFetchNameValue(papszOptions, "COMPRESS");
+	if (compress && EQUAL(compress, "ZSTD")) {
+		const char *creationOptions = p_driver->GetMetadataItem(GDAL_DMD_CREATIONOPTIONLIST);
+		if (!creationOptions || !std::strstr(creationOptions, "ZSTD")) {
+			papszOptions = CSLSetNameValue(papszOptions, "COMPRESS", "DEFLATE");
+			papszOptions = CSLSetNameValue(papszOptions, "ZSTD_LEVEL", nullptr);
+		}
+	}
+
 	GDALDataset *p_dataset = p_driver->Create(
 		filename.c_str(),
 		width,
@@ -442,6 +459,53 @@ createDataset(
 	return p_dataset;
 }
 
+/**
+ * @ingroup helper
+ * This helper function builds overviews for a dataset which has been
+ * written to disk. Overviews allow downsampled reads, such as those
+ * used when plotting, to be served from a small pre-computed level
+ * rather than the full resolution bands.
+ *
+ * Overview levels of 2, 4, 8, 16, and 32 are created, stopping once
+ * the overview would be smaller than 64 pixels in either dimension. Nearest neighbour resampling is used so that
+ * the categorical values of stratified rasters are preserved.
+ *
+ * @param GDALDataset *p_dataset
+ * @param int width
+ * @param int height
+ */
+inline void
+buildOverviews(
+	GDALDataset *p_dataset,
+	int width,
+	int height)
+{
+	std::vector<int> levels;
+	for (int level = 2; level <= 32; level *= 2) {
+		if (width / level < 64 || height / level < 64) {
+			break;
+		}
+		levels.push_back(level);
+	}
+
+	if (levels.empty()) {
+		return;
+	}
+
+	CPLErr err = GDALBuildOverviews(
+		GDALDataset::ToHandle(p_dataset),
+		"NEAREST",
+		static_cast<int>(levels.size()),
+		levels.data(),
+		0,
+		nullptr,
+		nullptr,
+		nullptr
+	);
+	if (err) {
+		throw std::runtime_error("error building overviews.");
+	}
+}
 
 /**
  * @ingroup helper
@@ -0,0 +1,56 @@
+# ******************************************************************************
+#
+#  Project: sgs
+#  Purpose: default creation options for output raster files
+#  Author: Joseph Meyer
+#  Date: October, 2025
+#
+# ******************************************************************************
+
+#compression types which may be passed as the 'compress' parameter of functions writing output files
+COMPRESS_OPTIONS = ['zstd', 'deflate', 'lzw', 'none']
+
+def default_driver_options(
+    compress: str,
+    predictor: int,
+    large_raster: bool
+    ):
+    """
+    Returns the default GTiff creation options used when an output raster is
+    written to a file. User given driver options should take precedence over these.
+
+    If compress is not 'none' the output is compressed using the given predictor,
+    which should be 2 (horizontal differencing) for integer output or 3 (floating
+    point) for floating point output. 'zstd' is written at level 1, and is replaced
+    by 'deflate' on the C++ side if the GDAL build does not support it.
+
+    Rasters which are small enough to be processed in memory are written as 512x512
+    tiles. Large rasters are written in blocks which follow the input raster's block
+    structure, so no tiling options are set for them.
+
+    Parameters:
+    compress : str
+        one of 'zstd', 'deflate', 'lzw', or 'none'
+    predictor : int
+        the TIFF predictor to use if the output is compressed
+    large_raster : bool
+        whether the raster is processed in blocks
+
+    Returns:
+    dict[str, str]
+    """
+    options = {}
+    if compress != 'none':
+        options["COMPRESS"] = compress.upper()
+        options["PREDICTOR"] = str(predictor)
+        options["NUM_THREADS"] = "ALL_CPUS"
+    if compress == 'zstd':
+        options["ZSTD_LEVEL"] = "1"
+    options["BIGTIFF"] = "IF_SAFER"
+
+    if not large_raster:
+        options["TILED"] = "YES"
+        options["BLOCKXSIZE"] = "512"
+        options["BLOCKYSIZE"] = "512"
+
+    return options
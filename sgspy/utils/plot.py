@@ -59,9 +59,15 @@ def plot_raster(raster,
     elif (target_downscaling_factor <= 8 / 1.2):
         downsampled_width = int(raster.width / 4)
         downsampled_height = int(raster.height / 4)
-    else:
+    elif (target_downscaling_factor <= 16 / 1.2):
         downsampled_width = int(raster.width / 8)
         downsampled_height = int(raster.height / 8)
+    elif (target_downscaling_factor <= 32 / 1.2):
+        downsampled_width = int(raster.width / 16)
+        downsampled_height = int(raster.height / 16)
+    else:
+        downsampled_width = int(raster.width / 32)
+        downsampled_height = int(raster.height / 32)
 
     #get the raster data from the cpp object as a numpy array, and ensure no data is nan
     no_data_val = raster.cpp_raster.get_band_nodata_value(band)
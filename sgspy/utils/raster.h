@@ -112,6 +112,15 @@ class GDALRasterWrapper {
 		//allocate data
 		void *p_data = VSIMalloc3(height, width, size);
 
+		//let GDAL map uncompressed GeoTIFF files into memory rather than decoding
+		//them block by block for this read, unless the user has already configured
+		//this behaviour themselves. Compressed files are unaffected. The option is
+		//only set on this thread, and is unset again once the read is done.
+		bool setVirtualMemIO = !CPLGetConfigOption("GTIFF_VIRTUAL_MEM_IO", nullptr);
+		if (setVirtualMemIO) {
+			CPLSetThreadLocalConfigOption("GTIFF_VIRTUAL_MEM_IO", "IF_ENOUGH_RAM");
+		}
+
 		//perform raster read on current band
 		CPLErr err = this->p_dataset->GetRasterBand(band + 1)->RasterIO(
 			GF_Read, 			//GDALRWFlag eRWFlag
@@ -126,6 +135,11 @@ class GDALRasterWrapper {
 			0,				//int nPixelSpace
 			0				//int nLineSpace
 		);
+
+		if (setVirtualMemIO) {
+			CPLSetThreadLocalConfigOption("GTIFF_VIRTUAL_MEM_IO", nullptr);
+		}
+
 		if (err) {
 			throw std::runtime_error("error reading raster band from dataset.");
 		}
@@ -221,7 +235,7 @@ class GDALRasterWrapper {
 		
 		//must register drivers before trying to open a dataset
 		GDALAllRegister();
-	
+
 		//dataset
 		GDALDataset *p_dataset = GDALDataset::FromHandle(GDALOpen(filename.c_str(), GA_ReadOnly));
 		if (!p_dataset) {
@@ -309,6 +323,10 @@ class GDALRasterWrapper {
 			type = GDT_Int8;
 			size = sizeof(int8_t);
 		}
+		else if (info.format == py::format_descriptor<uint8_t>::format()) {
+			type = GDT_Byte;
+			size = sizeof(uint8_t);
+		}
 		else if (info.format == py::format_descriptor<int16_t>::format()) {
 			type = GDT_Int16;
 			size = sizeof(int16_t);
@@ -334,7 +352,7 @@ class GDALRasterWrapper {
 			size = sizeof(double);
 		}
 		else {
-			throw std::runtime_error("data type of array must be one of int8, int16, uint16, int32, uint32, float32, or float64.");
+			throw std::runtime_error("data type of array must be one of int8, uint8, int16, uint16, int32, uint32, float32, or float64.");
 		}
 
 		GDALAllRegister();
@@ -651,6 +669,8 @@ class GDALRasterWrapper {
 		switch(type) {
 			case GDT_Int8:
 				return getBuffer<int8_t>(sizeof(int8_t), p_buffer, width, height);
+			case GDT_Byte:
+				return getBuffer<uint8_t>(sizeof(uint8_t), p_buffer, width, height);
 			case GDT_UInt16:
 				return getBuffer<uint16_t>(sizeof(uint16_t), p_buffer, width, height);
 			case GDT_Int16:
@@ -735,6 +755,7 @@ class GDALRasterWrapper {
 	size_t getRasterBandTypeSize(int band) {
 		switch (this->getRasterBandType(band)) {
 			case GDALDataType::GDT_Int8:
+			case GDALDataType::GDT_Byte:
 				return 1;
 			case GDALDataType::GDT_UInt16:
 			case GDALDataType::GDT_Int16:
@@ -823,6 +844,7 @@ class GDALRasterWrapper {
 
 		switch (type) {
 			case GDT_Int8: return "int8";
+			case GDT_Byte: return "uint8";
 			case GDT_UInt16: return "uint16";
 			case GDT_Int16: return "int16";
 			case GDT_UInt32: return "uint32";
@@ -162,6 +162,7 @@ class SpatialRaster:
     temp_dataset = False
     filename = ""
     closed = False
+    cpp_arr = None
 
     def __init__(self, 
                  image: str | GDALRasterWrapper):
@@ -244,6 +245,8 @@ class SpatialRaster:
         Parameters:
         band : str or int
             string representing a band or int representing a band
+
+        Raises a ValueError if band is a string which is not the name of a band in the raster.
         """
         if type(band) not in [str, int]:
             raise TypeError("'band' parameter must be of type str or int.")
@@ -252,6 +255,8 @@ class SpatialRaster:
             raise RuntimeError("the C++ object which this class wraps has been cleaned up and closed.")
 
         if type(band) == str:
+            if band not in self.band_name_dict:
+                raise ValueError("'band' parameter, if given as a str, must correspond to a band name within the raster (see SpatialRaster.bands).")
             band = self.band_name_dict[band]
 
         return band
@@ -279,6 +284,10 @@ class SpatialRaster:
         """
         gets a numpy array with the specified bands data.
 
+        The band is read once and cached, and the returned array is a read-only
+        view of the data held by the C++ object, so it must not be modified
+        in place. Use .copy() to obtain a writeable array.
+
         Parameters:
         band : int | str
             string or int representing band
@@ -322,10 +331,10 @@ class SpatialRaster:
             raise RuntimeError("the C++ object which this class wraps has been cleaned up and closed.")
 
         if ax is not None:
-            plot_raster(self, ax, target_width, target_width, band, **kwargs)
+            plot_raster(self, ax, target_width, target_height, band, **kwargs)
         else:
             fig, ax = plt.subplots()
-            plot_raster(self, ax, target_width, target_width, band, **kwargs)
+            plot_raster(self, ax, target_width, target_height, band, **kwargs)
             plt.show()
        
     @classmethod
@@ -335,6 +344,10 @@ class SpatialRaster:
         object. A np.ndarray may be passed as the 'arr' parameter, if so, the following must be true:
         arr.shape == (ds.count, ds.height, ds.width)
 
+        If arr is C-contiguous it is used directly as the data of the raster without being copied,
+        and is kept alive for the lifetime of the SpatialRaster. Changes made to arr afterwards will
+        be visible in the raster.
+
         Examples:
 
         ds = rasterio.open("rast.tif")
@@ -392,9 +405,12 @@ class SpatialRaster:
             #create an in-memory dataset using the numpy array as the data, and the rasterio dataset to provide metadata
             geotransform = ds.get_transform()
             projection = ds.crs.wkt
-            cls.cpp_arr = np.ascontiguousarray(arr)
-            buffer = memoryview(cls.cpp_arr)
-            return cls(GDALRasterWrapper(buffer, geotransform, projection, [nan] * ds.count, ds.descriptions, PROJDB_PATH))
+            cpp_arr = np.ascontiguousarray(arr)
+            rast = cls(GDALRasterWrapper(memoryview(cpp_arr), geotransform, projection, [nan] * ds.count, ds.descriptions, PROJDB_PATH))
+
+            #the C++ object does not own the array data, so it must be kept alive with the raster
+            rast.cpp_arr = cpp_arr
+            return rast
 
     def to_rasterio(self, with_arr = False):
         """
@@ -431,6 +447,7 @@ class SpatialRaster:
             #ensure numpy array doesn't accidentally get cleaned up by C++ object deletion
             self.cpp_raster.release_band_buffers()
 
+        if with_arr:
             arr = np.stack(bands, axis=0)
 
         if in_mem:
@@ -453,9 +470,10 @@ class SpatialRaster:
             self.closed = True
 
             ds = rasterio.MemoryFile().open(driver=driver, width=width, height=height, count=count, crs=crs, transform=transform, dtype=dtype, nodata=nan)
-            ds.write(arr)
         
+            #write each band directly, rather than stacking them into an intermediate array first
             for i in range(len(self.bands)):
+                ds.write(bands[i], i + 1)
                 ds.set_band_description(i + 1, self.bands[i]) 
         else:
             ds = rasterio.open(self.filename)
@@ -472,6 +490,10 @@ class SpatialRaster:
         object. A np.ndarray may be passed as the 'arr' parameter, if so, the following must be true:
         arr.shape == (ds.RasterCount, ds.RasterYSize, ds.RasterXSize)
 
+        If arr is C-contiguous it is used directly as the data of the raster without being copied,
+        and is kept alive for the lifetime of the SpatialRaster. Changes made to arr afterwards will
+        be visible in the raster.
+
         Examples:
 
         ds = gdal.Open("rast.tif")
@@ -493,10 +515,8 @@ class SpatialRaster:
             raise TypeError("the ds parameter passed to from_gdal() must be of type gdal.Dataset")
     
         if ds.GetDriver().ShortName == "MEM" and arr is None:
-            bands = []
-            for i in range(1, ds.RasterCount + 1):
-                bands.append(ds.GetRasterBand(i).ReadAsArray())
-            arr = np.stack(bands, axis=0)
+            #read all bands at once into a single (band_count, height, width) array
+            arr = ds.ReadAsArray()
 
         if arr is not None:
             if type(arr) is not np.ndarray:
@@ -527,11 +547,14 @@ class SpatialRaster:
 
             geotransform = ds.GetGeoTransform()
             projection = ds.GetProjection()
-            cls.cpp_arr = np.ascontiguousarray(arr)
-            buffer = memoryview(cls.cpp_arr)
+            cpp_arr = np.ascontiguousarray(arr)
             
             ds.Close()
-            return cls(GDALRasterWrapper(buffer, geotransform, projection, nan_vals, band_names, PROJDB_PATH))
+            rast = cls(GDALRasterWrapper(memoryview(cpp_arr), geotransform, projection, nan_vals, band_names, PROJDB_PATH))
+
+            #the C++ object does not own the array data, so it must be kept alive with the raster
+            rast.cpp_arr = cpp_arr
+            return rast
         else:
             filename = ds.GetName()
             
@@ -570,6 +593,7 @@ class SpatialRaster:
             #ensure numpy array doesn't accidentally get cleaned up by C++ object deletion
             self.cpp_raster.release_band_buffers()
 
+        if with_arr:
             arr = np.stack(bands, axis=0)            
 
         if in_mem:
@@ -586,11 +610,12 @@ class SpatialRaster:
             ds = gdal.GetDriverByName("MEM").Create("", self.width, self.height, 0, gdal.GDT_Unknown)
             ds.SetGeoTransform(geotransform)
             ds.SetProjection(projection)
-            # NOTE: copying from an in-memory GDAL dataset then writing to a rasterio MemoryFile() may cause extra data copying.
-            #
-            # I'm dong it this way for now instead of somehow passing the data pointer directly, for fear of memory leaks/dangling pointers/accidentally deleting memory still in use.
-            for i in range(1, arr.shape[0] + 1):
-                band_arr = arr[i - 1]
+
+            # NOTE: the band data is copied into the MEM dataset with WriteArray rather than aliased with the
+            # DATAPOINTER option. The buffers backing 'bands' are not owned by GDAL, and a MEM band created on
+            # top of them would neither free them nor keep them alive for as long as the dataset is in use.
+            for i in range(1, len(bands) + 1):
+                band_arr = bands[i - 1]
                 ds.AddBand(gdal_array.NumericTypeCodeToGDALTypeCode(band_arr.dtype))
                 band = ds.GetRasterBand(i)
                 band.WriteArray(band_arr)
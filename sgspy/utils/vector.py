@@ -14,6 +14,7 @@ import tempfile
 from typing import Optional
 import warnings
 
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib #fpr type checking matplotlib.axes.Axes
 
@@ -149,6 +150,23 @@ class SpatialVector:
         else:
             return self.cpp_vector.get_wkt_points('samples')
 
+    def samples_as_xy(self):
+        """
+        Calls get_points on the underlying cpp class, to return
+        the samples as a numpy array of coordinates with shape (n, 2),
+        where column 0 is the x coordinate and column 1 is the y coordinate.
+
+        This avoids the cost of formatting and re-parsing wkt strings when
+        only the sample coordinates are required. The same requirements
+        on the 'samples' layer as samples_as_wkt() apply, and a ValueError
+        is raised if there is no 'samples' layer.
+        """
+        if "samples" not in self.layers:
+            raise ValueError("this vector does not have a layer 'samples'")
+
+        [xs, ys] = self.cpp_vector.get_points('samples')
+        return np.column_stack((xs, ys))
+
     def plot(self,
         geomtype: str,
         ax: Optional[matplotlib.axes.Axes] = None,
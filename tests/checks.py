@@ -0,0 +1,9 @@
+import numpy as np
+
+#checks shared by the test modules of the stratification functions
+
+def check_mapping(map_band, *strat_bands):
+    #every map stratification must occur with exactly one combination of the stratifications it was mapped from
+    strata = np.stack([map_band, *strat_bands], axis=-1).reshape(-1, len(strat_bands) + 1)
+    combinations = np.unique(strata, axis=0)
+    assert len(np.unique(combinations[:, 0])) == len(combinations)
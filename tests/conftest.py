@@ -0,0 +1,47 @@
+import pytest
+
+#give failed asserts in the shared checks the same detailed messages as those in the test modules
+pytest.register_assert_rewrite("checks")
+
+import sgspy as sgs
+
+from files import (
+    mraster_geotiff_path,
+    mraster_small_geotiff_path,
+    sraster_geotiff_path,
+    sraster2_geotiff_path,
+    access_shapefile_path,
+    existing_shapefile_path,
+    inventory_polygons_shapefile_path,
+)
+
+#the input datasets are only ever read by the tests, so they are opened once
+#per session and shared rather than being re-opened by every test module.
+
+@pytest.fixture(scope="session")
+def mraster():
+    return sgs.SpatialRaster(mraster_geotiff_path)
+
+@pytest.fixture(scope="session")
+def mraster_small():
+    return sgs.SpatialRaster(mraster_small_geotiff_path)
+
+@pytest.fixture(scope="session")
+def sraster():
+    return sgs.SpatialRaster(sraster_geotiff_path)
+
+@pytest.fixture(scope="session")
+def sraster2():
+    return sgs.SpatialRaster(sraster2_geotiff_path)
+
+@pytest.fixture(scope="session")
+def access_vect():
+    return sgs.SpatialVector(access_shapefile_path)
+
+@pytest.fixture(scope="session")
+def existing_vect():
+    return sgs.SpatialVector(existing_shapefile_path)
+
+@pytest.fixture(scope="session")
+def inventory_vect():
+    return sgs.SpatialVector(inventory_polygons_shapefile_path)
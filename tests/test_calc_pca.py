@@ -1,42 +1,83 @@
+import sys
 import pytest
 import numpy as np
 
 import sgspy as sgs
 
-from files import (
-    mraster_geotiff_path,
-    pca_result_path
-)
+from files import pca_result_path
+
+#the module which pca() is defined in, used to lower the size at which
+#a raster is processed in blocks so the large raster path can be tested.
+pca_module = sys.modules["sgspy.calculate.pca.pca"]
+
+@pytest.fixture
+def large_raster(monkeypatch):
+    monkeypatch.setattr(pca_module, "GIGABYTE", 1)
 
 class TestPCA:
-    #input raster
-    rast = sgs.SpatialRaster(mraster_geotiff_path)
+    #output raster from a known correct run
     pca_result = sgs.SpatialRaster(pca_result_path)
 
-    def test_result(self):
-        pca = sgs.pca(self.rast, num_comp=3)
-        test = pca.band(0)
-        correct = self.pca_result.band(0)
+    def test_result(self, mraster):
+        pca = sgs.pca(mraster, num_comp=3)
+        test = np.stack([pca.band(i) for i in range(3)])
+        correct = np.stack([self.pca_result.band(i) for i in range(3)])
         np.testing.assert_almost_equal(correct, test, decimal=3)
-        
-        test = pca.band(1)
-        correct = self.pca_result.band(1)
+
+    def test_result_large_raster(self, mraster, large_raster):
+        pca = sgs.pca(mraster, num_comp=3)
+        test = np.stack([pca.band(i) for i in range(3)])
+        correct = np.stack([self.pca_result.band(i) for i in range(3)])
         np.testing.assert_almost_equal(correct, test, decimal=3)
 
-        test = pca.band(2)
-        correct = self.pca_result.band(2)
+    @pytest.mark.parametrize("compress", ['zstd', 'deflate', 'none'])
+    def test_write_functionality(self, tmp_path, mraster, compress):
+        temp_file = tmp_path / "pca.tif"
+        sgs.pca(mraster, num_comp=3, filename=str(temp_file), compress=compress)
+        pca = sgs.SpatialRaster(str(temp_file))
+        test = np.stack([pca.band(i) for i in range(3)])
+        correct = np.stack([self.pca_result.band(i) for i in range(3)])
         np.testing.assert_almost_equal(correct, test, decimal=3)
 
-    def test_inputs(self):
-        pca = sgs.pca(self.rast, num_comp=3)
-        pca = sgs.pca(self.rast, num_comp=2)
-        pca = sgs.pca(self.rast, num_comp=1)
+    def check_uint8(self, pca):
+        for i in range(3):
+            test = pca.band(i)
+            assert test.dtype == np.uint8
+
+            #quantized values should be almost perfectly correlated with the float result
+            correct = self.pca_result.band(i)
+            valid = ~np.isnan(correct)
+            assert (test[valid] != 0).all()
+            assert (test[~valid] == 0).all()
+            assert np.corrcoef(correct[valid], test[valid].astype(np.float64))[0, 1] > 0.99
+
+    def test_uint8(self, mraster):
+        pca = sgs.pca(mraster, num_comp=3, dtype='uint8')
+        self.check_uint8(pca)
+
+    def test_uint8_large_raster(self, mraster, large_raster):
+        pca = sgs.pca(mraster, num_comp=3, dtype='uint8')
+        self.check_uint8(pca)
+
+    def test_inputs(self, mraster):
+        pca = sgs.pca(mraster, num_comp=3)
+        pca = sgs.pca(mraster, num_comp=2)
+        pca = sgs.pca(mraster, num_comp=1)
+
+        with pytest.raises(ValueError):
+            pca = sgs.pca(mraster, num_comp=0)
 
         with pytest.raises(ValueError):
-            pca = sgs.pca(self.rast, num_comp=0)
+            pca = sgs.pca(mraster, num_comp=-1)
+
+        with pytest.raises(ValueError):
+            pca = sgs.pca(mraster, num_comp=4)
+
+        with pytest.raises(TypeError):
+            pca = sgs.pca(mraster, num_comp=3, dtype=np.uint8)
 
         with pytest.raises(ValueError):
-            pca = sgs.pca(self.rast, num_comp=-1)
+            pca = sgs.pca(mraster, num_comp=3, dtype='bf16')
 
         with pytest.raises(ValueError):
-            pca = sgs.pca(self.rast, num_comp=4)
+            pca = sgs.pca(mraster, num_comp=3, compress='jpeg')
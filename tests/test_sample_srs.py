@@ -5,124 +5,114 @@ import pytest
 import sgspy as sgs
 
 from files import (
-    mraster_geotiff_path,
-    mraster_small_geotiff_path,
     access_shapefile_path,
     existing_shapefile_path,
 )
 
 class TestSrs:
-    rast = sgs.SpatialRaster(mraster_small_geotiff_path)
-    
-    mrast_full = sgs.SpatialRaster(mraster_geotiff_path)
-    access = sgs.SpatialVector(access_shapefile_path)
-    existing = sgs.SpatialVector(existing_shapefile_path)
-
-    def test_num_points(self):
+    def test_num_points(self, mraster_small):
         with pytest.raises(ValueError):
-            samples = sgs.srs(self.rast, num_samples=0)
+            samples = sgs.srs(mraster_small, num_samples=0)
 
-        sample = sgs.srs(self.rast, num_samples=1).samples_as_wkt()
+        sample = sgs.srs(mraster_small, num_samples=1).samples_as_xy()
         assert len(sample) == 1
 
-        samples = sgs.srs(self.rast, num_samples=50).samples_as_wkt()
+        samples = sgs.srs(mraster_small, num_samples=50).samples_as_xy()
         assert len(samples) == 50
 
-        samples = sgs.srs(self.rast, num_samples=2000).samples_as_wkt()
+        samples = sgs.srs(mraster_small, num_samples=2000).samples_as_xy()
         assert len(samples) == 2000
 
-    def test_mindist(self):
-        def check_samples(mindist, samples):
-            gs = gpd.GeoSeries.from_wkt(samples)
-            for i in range(len(samples) - 1):
-                distances = gs[i].distance(gs[i+1:])
-                assert 0 == int(np.sum(np.array([distances < mindist]).astype(int)))
-
-        mindist = 1
-        samples = sgs.srs(self.rast, mindist=mindist, num_samples=1000).samples_as_wkt() 
-        check_samples(mindist, samples)
-
-        mindist = 50
-        samples = sgs.srs(self.rast, mindist=mindist, num_samples=1000).samples_as_wkt()
-        check_samples(mindist, samples)
-
-        mindist = 200.5
-        samples = sgs.srs(self.rast, mindist=mindist, num_samples=1000).samples_as_wkt()
-        check_samples(mindist, samples)
-
-        mindist = 6000
-        samples = sgs.srs(self.rast, mindist=mindist, num_samples=1000).samples_as_wkt()
-        check_samples(mindist, samples)
-
-    def test_points_in_bounds(self):
-        samples = sgs.srs(self.rast, num_samples=1000).samples_as_wkt()
-        gs = gpd.GeoSeries.from_wkt(samples)
+    def test_samples_as_xy(self, mraster_small):
+        samples = sgs.srs(mraster_small, num_samples=100)
+        xy = samples.samples_as_xy()
+        gs = gpd.GeoSeries.from_wkt(samples.samples_as_wkt())
+
+        assert xy.shape == (100, 2)
+        np.testing.assert_allclose(xy[:, 0], gs.x.to_numpy())
+        np.testing.assert_allclose(xy[:, 1], gs.y.to_numpy())
+
+    @pytest.mark.parametrize("mindist", [1, 50, 200.5, 6000])
+    def test_mindist(self, mraster_small, mindist):
+        samples = sgs.srs(mraster_small, mindist=mindist, num_samples=1000).samples_as_xy()
+        gs = gpd.GeoSeries.from_xy(*samples.T)
+
+        #use the spatial index to find candidate pairs within mindist of each other,
+        #then check the exact distance of each distinct pair
+        [left, right] = gs.sindex.query(gs, predicate="dwithin", distance=mindist)
+        pairs = left < right
+        distances = gs.iloc[left[pairs]].distance(gs.iloc[right[pairs]], align=False)
+        assert not (distances.to_numpy() < mindist).any()
+
+    def test_points_in_bounds(self, mraster_small):
+        samples = sgs.srs(mraster_small, num_samples=1000).samples_as_xy()
+        gs = gpd.GeoSeries.from_xy(*samples.T)
         
         #ensure all points are within raster bounds
-        for point in gs:
-           assert point.x <= self.rast.xmax
-           assert point.x >= self.rast.xmin
-           assert point.y <= self.rast.ymax
-           assert point.y >= self.rast.ymin
+        xs = gs.x.to_numpy()
+        ys = gs.y.to_numpy()
+        assert np.all((xs >= mraster_small.xmin) & (xs <= mraster_small.xmax))
+        assert np.all((ys >= mraster_small.ymin) & (ys <= mraster_small.ymax))
 
-    def test_points_not_nan(self):
-        samples = sgs.srs(self.rast, num_samples=1000).samples_as_wkt()
-        gs = gpd.GeoSeries.from_wkt(samples)
+    def test_points_not_nan(self, mraster_small):
+        samples = sgs.srs(mraster_small, num_samples=1000).samples_as_xy()
+        gs = gpd.GeoSeries.from_xy(*samples.T)
 
         #find indexes for all points and ensure they're not nan pixels.
-        for point in gs:
-            x_index = (point.x - self.rast.xmin) / self.rast.pixel_width
-            y_index = self.rast.height - ((point.y - self.rast.ymin) / self.rast.pixel_height) #origin at top left instead of bottom left
-            pixel_value = self.rast.band(0)[int(y_index), int(x_index)]
-            if np.isnan(pixel_value):
-                print(point.x)
-                print(point.y)
-                print(x_index)
-                print(y_index)
-                assert False
+        x_index = ((gs.x.to_numpy() - mraster_small.xmin) / mraster_small.pixel_width).astype(np.intp)
+        y_index = (mraster_small.height - ((gs.y.to_numpy() - mraster_small.ymin) / mraster_small.pixel_height)).astype(np.intp) #origin at top left instead of bottom left
+        pixel_values = mraster_small.band(0)[y_index, x_index]
+        assert not np.isnan(pixel_values).any(), gs[np.isnan(pixel_values)]
  
-    def test_write_output(self, tmp_path):
+    def test_write_output(self, tmp_path, mraster_small):
         temp_dir = tmp_path / "test_out"
         temp_dir.mkdir()
 
         temp_file = temp_dir / "vect.shp"
-        gs_samples = sgs.srs(self.rast, num_samples = 1000, filename=str(temp_file)).to_geopandas()['geometry']
+        gs_samples = sgs.srs(mraster_small, num_samples = 1000, filename=str(temp_file)).to_geopandas()['geometry']
         gs_file = gpd.read_file(temp_file)
-        
-        assert len(gs_samples.intersection(gs_file)) == 1000
 
-    def test_access(self):
+        #compare the point coordinates directly, sorted so that feature order doesn't matter
+        test = gs_file.get_coordinates().to_numpy()
+        correct = gs_samples.get_coordinates().to_numpy()
+        assert len(test) == 1000
+        np.testing.assert_allclose(test[np.lexsort(test.T)], correct[np.lexsort(correct.T)])
+
+    def check_access(self, samples, gs_access, buff_inner, buff_outer):
+        #rather than building the union of every buffered access line, query the spatial
+        #index of the individual buffers. Every sample must be within at least one outer
+        #buffer, and must not touch any inner buffer.
+        [within_outer, _] = gs_access.buffer(buff_outer).sindex.query(samples, predicate="within")
+        assert np.unique(within_outer).size == len(samples)
+
+        if buff_inner > 0:
+            [within_inner, _] = gs_access.buffer(buff_inner).sindex.query(samples, predicate="intersects")
+            assert within_inner.size == 0
+
+    def test_access(self, mraster, access_vect):
         gs_access = gpd.read_file(access_shapefile_path)
 
         #test just buff_outer working
-        samples = gpd.GeoSeries.from_wkt(sgs.srs(self.mrast_full, 50000, access=self.access, buff_outer=100).samples_as_wkt())
-        accessable = gs_access.buffer(100).union_all()
-        for sample in samples:
-            assert accessable.contains(sample)
+        samples = gpd.GeoSeries.from_xy(*sgs.srs(mraster, 50000, access=access_vect, buff_outer=100).samples_as_xy().T)
+        self.check_access(samples, gs_access, 0, 100)
 
         #test buff_outer works with mindist
-        samples = gpd.GeoSeries.from_wkt(sgs.srs(self.mrast_full, 50000, 200, access=self.access, buff_outer=100).samples_as_wkt())
-        #accessable stays the same because buff_outer is the same
-        for sample in samples:
-            assert accessable.contains(sample)
+        samples = gpd.GeoSeries.from_xy(*sgs.srs(mraster, 50000, 200, access=access_vect, buff_outer=100).samples_as_xy().T)
+        self.check_access(samples, gs_access, 0, 100)
 
         #test buff_outer and buff_inner works
-        bad_points=[]
-        samples = gpd.GeoSeries.from_wkt(sgs.srs(self.mrast_full, 50000, access=self.access, buff_outer=200, buff_inner=100).samples_as_wkt())
-        accessable = gs_access.buffer(200).union_all().difference(gs_access.buffer(100).union_all())
-        for sample in samples:
-            assert accessable.contains(sample)
-
-        samples = gpd.GeoSeries.from_wkt(sgs.srs(self.mrast_full, 50000, 200, access=self.access, buff_outer=200, buff_inner=100).samples_as_wkt())
-        #accessable stays the same because buff_outer and buff_inner are the same
-        for sample in samples:
-            assert accessable.contains(sample)
-
-    def test_existing(self):
+        samples = gpd.GeoSeries.from_xy(*sgs.srs(mraster, 50000, access=access_vect, buff_outer=200, buff_inner=100).samples_as_xy().T)
+        self.check_access(samples, gs_access, 100, 200)
+
+        samples = gpd.GeoSeries.from_xy(*sgs.srs(mraster, 50000, 200, access=access_vect, buff_outer=200, buff_inner=100).samples_as_xy().T)
+        self.check_access(samples, gs_access, 100, 200)
+
+    def test_existing(self, mraster, existing_vect):
         existing = gpd.read_file(existing_shapefile_path)['geometry']
-        samples = gpd.GeoSeries.from_wkt(sgs.srs(self.mrast_full, 1000, existing=self.existing).samples_as_wkt())
+        samples = gpd.GeoSeries.from_xy(*sgs.srs(mraster, 1000, existing=existing_vect).samples_as_xy().T)
 
-        for sample in existing:
-            assert samples.contains(sample).any()
+        #every existing point must coincide with at least one sample
+        [existing_index, _] = samples.sindex.query(existing, predicate="intersects")
+        assert np.unique(existing_index).size == len(existing)
     
     #TODO test input values
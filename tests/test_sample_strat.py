@@ -6,176 +6,139 @@ import pytest
 import sgspy as sgs
 
 from files import (
-    mraster_geotiff_path,
     access_shapefile_path,
     existing_shapefile_path,
 )
 
+#equal allocation cases: (num_samples, mindist, (buff_inner, buff_outer) or None, min_samples, tolerance)
+#mindist means we might not get the full number of samples, hence min_samples
+equal_allocation_cases = [
+    pytest.param(500, None, None, 500, 1e-12, id="default"),
+    pytest.param(500, 150, None, 491, 0.03, id="mindist"),
+    pytest.param(500, None, (90, 300), 500, 0.03, id="access"),
+    pytest.param(100, 90, (0, 600), 91, 0.03, id="access_mindist"),
+]
+
 class TestStrat:
-    rast = sgs.SpatialRaster(mraster_geotiff_path)
-    access = sgs.SpatialVector(access_shapefile_path)
-    existing = sgs.SpatialVector(existing_shapefile_path)
+    #accessible areas are the same for every test using the same buffers, so they're only computed once
+    gs_access = gpd.read_file(access_shapefile_path)
+    accessible_areas = {}
 
-    def check_points_in_bounds(self, srast, samples):
-        for point in samples:
-            assert point.x <= self.rast.xmax
-            assert point.x >= self.rast.xmin
-            assert point.y <= self.rast.ymax
-            assert point.y >= self.rast.ymin
+    #stratified rasters, keyed by the number of strata
+    stratified_rasters = {}
+
+    def get_srast(self, rast, num_strata):
+        if num_strata not in self.stratified_rasters:
+            self.stratified_rasters[num_strata] = sgs.stratify.quantiles(rast, quantiles={"zq90": num_strata})
+        return self.stratified_rasters[num_strata]
 
-            #also check to ensure pixel isn't nan
-            x = (point.x - self.rast.xmin) / self.rast.pixel_width
-            y = self.rast.height - ((point.y - self.rast.ymin) / self.rast.pixel_height)
+    def get_pixel_indices(self, srast, samples):
+        xmin = srast.xmin
+        ymin = srast.ymin
+        inv_pw = 1.0 / srast.pixel_width
+        inv_ph = 1.0 / srast.pixel_height
+        height = srast.height
 
-            pixel_val = srast.band(0)[int(y), int(x)]
+        x = ((samples.x.to_numpy() - xmin) * inv_pw).astype(np.intp)
+        y = (height - ((samples.y.to_numpy() - ymin) * inv_ph)).astype(np.intp) #origin at top left
+        return x, y
+
+    def check_points_in_bounds(self, srast, samples):
+        xs = samples.x.to_numpy()
+        ys = samples.y.to_numpy()
+        assert np.all((xs >= srast.xmin) & (xs <= srast.xmax))
+        assert np.all((ys >= srast.ymin) & (ys <= srast.ymax))
 
-            if np.isnan(pixel_val):
-                assert False
+        #also check to ensure pixels aren't nan
+        x, y = self.get_pixel_indices(srast, samples)
+        assert not np.isnan(srast.band(0)[y, x]).any()
 
     def check_mindist(self, mindist, samples):
-        for i in range(len(samples) - 1):
-            distances = samples[i].distance(samples[i+1:])
-            assert 0 == int(np.sum(np.array([distances < mindist]).astype(int)))
+        #use the spatial index to find candidate pairs within mindist of each other,
+        #then check the exact distance of each distinct pair
+        [left, right] = samples.sindex.query(samples, predicate="dwithin", distance=mindist)
+        pairs = left < right
+        distances = samples.iloc[left[pairs]].distance(samples.iloc[right[pairs]], align=False)
+        assert not (distances.to_numpy() < mindist).any()
 
     def check_access(self, samples, buff_inner, buff_outer):
-        gs_access = gpd.read_file(access_shapefile_path)
-        if (buff_inner == 0):
-            accessable = gs_access.buffer(buff_outer).union_all()
-        else:
-            accessable = gs_access.buffer(buff_outer).union_all().difference(gs_access.buffer(buff_inner).union_all())
-
-        for sample in samples:
-            assert accessable.contains(sample)
+        key = (buff_inner, buff_outer)
+        if key not in self.accessible_areas:
+            if (buff_inner == 0):
+                self.accessible_areas[key] = self.gs_access.buffer(buff_outer).union_all()
+            else:
+                self.accessible_areas[key] = self.gs_access.buffer(buff_outer).union_all().difference(self.gs_access.buffer(buff_inner).union_all())
+        assert samples.within(self.accessible_areas[key]).all()
 
     def check_focal_window(self, srast, samples, wrow, wcol):
-        for point in samples:
-            x = (point.x - self.rast.xmin) / self.rast.pixel_width
-            y = self.rast.height - ((point.y - self.rast.ymin) / self.rast.pixel_height) #origin at top left
+        band = srast.band(0)
+        x, y = self.get_pixel_indices(srast, samples)
 
-            for row in range(wrow):
-                for col in range(wcol):
-                    y_check = y + row - wrow // 2
-                    x_check = x + col - wcol // 2
-                    assert(srast.band(0)[int(y), int(x)] == srast.band(0)[int(y_check), int(x_check)])
+        #gather the (samples, wrow, wcol) stack of windows around every sample at once
+        row_offsets = np.arange(wrow) - wrow // 2
+        col_offsets = np.arange(wcol) - wcol // 2
+        windows = band[y[:, None, None] + row_offsets[None, :, None], x[:, None, None] + col_offsets[None, None, :]]
+        assert (windows == band[y, x][:, None, None]).all()
 
     def get_allocation_percentages(self, srast, samples):
-        allocation = {}
-        for point in samples:
-            x = (point.x - self.rast.xmin) / self.rast.pixel_width
-            y = self.rast.height - ((point.y - self.rast.ymin) / self.rast.pixel_height)
-            strata = srast.band(0)[int(y), int(x)]
-           
-            if strata in allocation:
-                allocation[strata] += 1
-            else:
-                allocation[strata] = 1
-
-        for key in allocation.keys():
-            allocation[key] = allocation[key] / len(samples)
-
-        return allocation
-
-    def test_random_allocation_equal(self):
-        srast = sgs.stratify.quantiles(self.rast, quantiles={"zq90": 5})
-
-        #without mindist or access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
-            srast, 
-            band='strat_zq90',
-            num_samples=500,
-            num_strata=5,
-            allocation="equal",
-            method="random",
-        ).samples_as_wkt())
-
-        assert len(samples) == 500
-        self.check_points_in_bounds(srast, samples)
-        percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.2 == pytest.approx(0)
-
-        #with mindist
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
-            srast,
-            band='strat_zq90',
-            num_samples=500,
-            num_strata=5,
-            allocation="equal",
-            method="random",
-            mindist=150,
-        ).samples_as_wkt())
-        
-        assert len(samples) > 490 #mindist means we might not get the full 500
-        self.check_points_in_bounds(srast, samples)
-        self.check_mindist(150, samples)
-        percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.2 == pytest.approx(0, abs=0.03)
-
-        #with access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        x, y = self.get_pixel_indices(srast, samples)
+        [strata, counts] = np.unique(srast.band(0)[y, x], return_counts=True)
+        return dict(zip(strata.tolist(), (counts / len(samples)).tolist()))
+
+    def count_existing_in_samples(self, existing, samples):
+        #use the spatial index of the samples to find every existing point which is also a sample
+        [existing_idx, _] = samples.sindex.query(existing, predicate="intersects")
+        return len(np.unique(existing_idx))
+
+    @pytest.mark.parametrize("num_samples, mindist, buffers, min_samples, tolerance", equal_allocation_cases)
+    def test_random_allocation_equal(self, mraster, access_vect, num_samples, mindist, buffers, min_samples, tolerance):
+        srast = self.get_srast(mraster, 5)
+
+        kwargs = {}
+        if mindist is not None:
+            kwargs['mindist'] = mindist
+        if buffers is not None:
+            kwargs.update(access=access_vect, layer_name='access', buff_inner=buffers[0], buff_outer=buffers[1])
+
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
-            num_samples=500,
-            num_strata=5,
-            allocation="equal",
-            method = "random",
-            access = self.access,
-            layer_name = 'access',
-            buff_inner = 90,
-            buff_outer = 300,
-        ).samples_as_wkt())
-
-        assert len(samples) == 500
-        self.check_points_in_bounds(srast, samples)
-        self.check_access(samples, 90, 300)
-        percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.2 == pytest.approx(0, abs=0.03)
-
-        #with access and mindist
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
-            srast,
-            band='strat_zq90',
-            num_samples=100,
+            num_samples=num_samples,
             num_strata=5,
             allocation="equal",
             method="random",
-            access = self.access,
-            layer_name = 'access',
-            buff_outer=600,
-            mindist=90,
-        ).samples_as_wkt())
+            **kwargs,
+        ).samples_as_xy().T)
 
-        assert len(samples) > 90 #mindist means we may not get the full 100
+        assert len(samples) >= min_samples
         self.check_points_in_bounds(srast, samples)
-        self.check_access(samples, 0, 600)
-        self.check_mindist(90, samples)
+        if mindist is not None:
+            self.check_mindist(mindist, samples)
+        if buffers is not None:
+            self.check_access(samples, *buffers)
         percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.2 == pytest.approx(0, abs=0.03)
+        np.testing.assert_allclose(list(percentages.values()), 0.2, rtol=0, atol=tolerance)
 
-    def test_random_allocation_proportional(self):
-        srast = sgs.stratify.quantiles(self.rast, quantiles={"zq90": 8})
+    def test_random_allocation_proportional(self, mraster, access_vect):
+        srast = self.get_srast(mraster, 8)
 
         #without mindist or access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast, 
             band='strat_zq90',
             num_samples=500,
             num_strata=8,
             allocation="prop",
             method="random"
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) == 500
         self.check_points_in_bounds(srast, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.125 == pytest.approx(0, abs=0.03)
+        np.testing.assert_allclose(list(percentages.values()), 0.125, rtol=0, atol=0.03)
 
         #with mindist
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
@@ -183,62 +146,59 @@ class TestStrat:
             allocation="prop",
             method="random",
             mindist=150,
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
         
         assert len(samples) > 490 #mindist means we may not get the full 500
         self.check_points_in_bounds(srast, samples)
         self.check_mindist(150, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.125 == pytest.approx(0, abs=0.03)
+        np.testing.assert_allclose(list(percentages.values()), 0.125, rtol=0, atol=0.03)
 
         #with access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
             num_strata=8,
             allocation="prop",
             method = "random",
-            access = self.access,
+            access = access_vect,
             layer_name = 'access',
             buff_inner = 90,
             buff_outer = 300,
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) == 500
         self.check_points_in_bounds(srast, samples)
         self.check_access(samples, 90, 300)
         percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.125 == pytest.approx(0, abs=0.03)
+        np.testing.assert_allclose(list(percentages.values()), 0.125, rtol=0, atol=0.03)
 
         #with access and mindist
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=128,
             num_strata=8,
             allocation="prop",
             method="random",
-            access = self.access,
+            access = access_vect,
             layer_name = 'access',
             buff_outer=600,
             mindist=90,
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) > 115 #mindist means we may not get the full 128 
         self.check_points_in_bounds(srast, samples)
         self.check_access(samples, 0, 600)
         self.check_mindist(90, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.125 == pytest.approx(0, abs=0.03)
+        np.testing.assert_allclose(list(percentages.values()), 0.125, rtol=0, atol=0.03)
 
-    def test_random_allocation_manual(self):
+    def test_random_allocation_manual(self, mraster, access_vect):
         #without mindist or access
-        srast = sgs.stratify.quantiles(self.rast, quantiles={"zq90": 4})
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        srast = self.get_srast(mraster, 4)
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
@@ -246,18 +206,16 @@ class TestStrat:
             allocation="manual",
             method="random",
             weights=[0.5, 0.25, 0.1, 0.15],
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) == 500
         self.check_points_in_bounds(srast, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        assert percentages[0] - 0.5 == pytest.approx(0, abs=0.03)
-        assert percentages[1] - 0.25 == pytest.approx(0, abs=0.03)
-        assert percentages[2] - 0.1 == pytest.approx(0, abs=0.03)
-        assert percentages[3] - 0.15 == pytest.approx(0, abs=0.03)
+        actual = [percentages[i] for i in range(4)]
+        np.testing.assert_allclose(actual, [0.5, 0.25, 0.1, 0.15], rtol=0, atol=0.03)
 
         #with mindist
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=100,
@@ -266,19 +224,17 @@ class TestStrat:
             method="random",
             weights=[0.5, 0.25, 0.1, 0.15],
             mindist=90,
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) > 90 #mindist means we may not get the full 100
         self.check_points_in_bounds(srast, samples)
         self.check_mindist(90, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        assert percentages[0] - 0.5 == pytest.approx(0, abs=0.03)
-        assert percentages[1] - 0.25 == pytest.approx(0, abs=0.03)
-        assert percentages[2] - 0.1 == pytest.approx(0, abs=0.03)
-        assert percentages[3] - 0.15 == pytest.approx(0, abs=0.03)
+        actual = [percentages[i] for i in range(4)]
+        np.testing.assert_allclose(actual, [0.5, 0.25, 0.1, 0.15], rtol=0, atol=0.03)
 
         #with access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=100,
@@ -286,23 +242,21 @@ class TestStrat:
             allocation="manual",
             method="random",
             weights=[0.5, 0.25, 0.1, 0.15],
-            access=self.access,
+            access=access_vect,
             layer_name='access',
             buff_inner=120,
             buff_outer=1200,
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) == 100
         self.check_points_in_bounds(srast, samples)
         self.check_access(samples, 120, 1200)
         percentages = self.get_allocation_percentages(srast, samples)
-        assert percentages[0] - 0.5 == pytest.approx(0, abs=0.03)
-        assert percentages[1] - 0.25 == pytest.approx(0, abs=0.03)
-        assert percentages[2] - 0.1 == pytest.approx(0, abs=0.03)
-        assert percentages[3] - 0.15 == pytest.approx(0, abs=0.03)
+        actual = [percentages[i] for i in range(4)]
+        np.testing.assert_allclose(actual, [0.5, 0.25, 0.1, 0.15], rtol=0, atol=0.03)
 
         #with mindist and access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=100,
@@ -310,181 +264,111 @@ class TestStrat:
             allocation="manual",
             method="random",
             weights=[0.5, 0.25, 0.1, 0.15],
-            access=self.access,
+            access=access_vect,
             layer_name='access',
             buff_outer=1200,
             mindist=90
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) > 90 #mindist means we may not get the full 90 
         self.check_points_in_bounds(srast, samples)
         self.check_access(samples, 0, 1200)
         self.check_mindist(90, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        assert percentages[0] - 0.5 == pytest.approx(0, abs=0.03)
-        assert percentages[1] - 0.25 == pytest.approx(0, abs=0.03)
-        assert percentages[2] - 0.1 == pytest.approx(0, abs=0.03)
-        assert percentages[3] - 0.15 == pytest.approx(0, abs=0.03)
+        actual = [percentages[i] for i in range(4)]
+        np.testing.assert_allclose(actual, [0.5, 0.25, 0.1, 0.15], rtol=0, atol=0.03)
 
-    def test_random_allocation_optim(self):
+    def test_random_allocation_optim(self, mraster):
         #test with mrast band = 0
-        srast = sgs.stratify.quantiles(self.rast, quantiles={"zq90": 10})
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        srast = self.get_srast(mraster, 10)
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
             num_strata=10,
             allocation="optim",
-            mrast=self.rast,
+            mrast=mraster,
             mrast_band=0,
             method="random",
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) == 500
         self.check_points_in_bounds(srast, samples)
         percentages = self.get_allocation_percentages(srast, samples)
         
         #these percentages have already been pre-calculated
-        assert percentages[0] - .18 == pytest.approx(0, abs=0.02)
-        assert percentages[1] - .12 == pytest.approx(0, abs=0.02)
-        assert percentages[2] - .10 == pytest.approx(0, abs=0.02)
-        assert percentages[3] - .07 == pytest.approx(0, abs=0.02)
-        assert percentages[4] - .06 == pytest.approx(0, abs=0.02)
-        assert percentages[5] - .05 == pytest.approx(0, abs=0.02)
-        assert percentages[6] - .05 == pytest.approx(0, abs=0.02)
-        assert percentages[7] - .04 == pytest.approx(0, abs=0.02)
-        assert percentages[8] - .07 == pytest.approx(0, abs=0.02)
-        assert percentages[9] - .26 == pytest.approx(0, abs=0.02)
+        actual = [percentages[i] for i in range(10)]
+        np.testing.assert_allclose(actual, [.18, .12, .10, .07, .06, .05, .05, .04, .07, .26], rtol=0, atol=0.02)
        
         #test with mrast band = 1
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
             num_strata=10,
             allocation="optim",
-            mrast=self.rast,
+            mrast=mraster,
             mrast_band=1,
             method="random",
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
     
         assert len(samples) == 500
         self.check_points_in_bounds(srast, samples)
         percentages = self.get_allocation_percentages(srast, samples)
         
         #these percentages have already been pre-calculated
-        assert percentages[0] - .12 == pytest.approx(0, abs=0.02)
-        assert percentages[1] - .15 == pytest.approx(0, abs=0.02)
-        assert percentages[2] - .14 == pytest.approx(0, abs=0.02)
-        assert percentages[3] - .11 == pytest.approx(0, abs=0.02)
-        assert percentages[4] - .10 == pytest.approx(0, abs=0.02)
-        assert percentages[5] - .09 == pytest.approx(0, abs=0.02)
-        assert percentages[6] - .08 == pytest.approx(0, abs=0.02)
-        assert percentages[7] - .07 == pytest.approx(0, abs=0.02)
-        assert percentages[8] - .07 == pytest.approx(0, abs=0.02)
-        assert percentages[9] - .07 == pytest.approx(0, abs=0.02)
-
-    def test_queinnec_allocation_equal(self):
-        srast = sgs.stratify.quantiles(self.rast, quantiles={"zq90": 5})
+        actual = [percentages[i] for i in range(10)]
+        np.testing.assert_allclose(actual, [.12, .15, .14, .11, .10, .09, .08, .07, .07, .07], rtol=0, atol=0.02)
 
-        #without mindist or access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
-            srast, 
-            band='strat_zq90',
-            num_samples=500,
-            num_strata=5,
-            allocation="equal",
-            method="Queinnec",
-        ).samples_as_wkt())
+    @pytest.mark.parametrize("num_samples, mindist, buffers, min_samples, tolerance", equal_allocation_cases)
+    def test_queinnec_allocation_equal(self, mraster, access_vect, num_samples, mindist, buffers, min_samples, tolerance):
+        srast = self.get_srast(mraster, 5)
 
-        assert len(samples) == 500
-        self.check_points_in_bounds(srast, samples)
-        percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.2 == pytest.approx(0)
+        kwargs = {}
+        if mindist is not None:
+            kwargs['mindist'] = mindist
+        if buffers is not None:
+            kwargs.update(access=access_vect, layer_name='access', buff_inner=buffers[0], buff_outer=buffers[1])
 
-        #with mindist
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
-            num_samples=500,
+            num_samples=num_samples,
             num_strata=5,
             allocation="equal",
             method="Queinnec",
-            mindist=150,
-        ).samples_as_wkt())
-       
-        assert len(samples) > 490 #mindist means we may not get the full 500 
-        self.check_points_in_bounds(srast, samples)
-        self.check_mindist(150, samples)
-        percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.2 == pytest.approx(0, abs=0.03)
+            **kwargs,
+        ).samples_as_xy().T)
 
-        #with access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
-            srast,
-            band='strat_zq90',
-            num_samples=500,
-            num_strata=5,
-            allocation="equal",
-            method = "Queinnec",
-            access = self.access,
-            layer_name = 'access',
-            buff_inner = 90,
-            buff_outer = 300,
-        ).samples_as_wkt())
-
-        assert len(samples) == 500
+        assert len(samples) >= min_samples
         self.check_points_in_bounds(srast, samples)
-        self.check_access(samples, 90, 300)
+        if mindist is not None:
+            self.check_mindist(mindist, samples)
+        if buffers is not None:
+            self.check_access(samples, *buffers)
         percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.2 == pytest.approx(0, abs=0.03)
+        np.testing.assert_allclose(list(percentages.values()), 0.2, rtol=0, atol=tolerance)
 
-        #with access and mindist
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
-            srast,
-            band='strat_zq90',
-            num_samples=100,
-            num_strata=5,
-            allocation="equal",
-            method="Queinnec",
-            access = self.access,
-            layer_name = 'access',
-            buff_outer=600,
-            mindist=90,
-        ).samples_as_wkt())
-
-        assert len(samples) > 90 #mindist means we may not get the full 90 
-        self.check_points_in_bounds(srast, samples)
-        self.check_access(samples, 0, 600)
-        self.check_mindist(90, samples)
-        percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.2 == pytest.approx(0, abs=0.03)
-
-    def test_queinnec_allocation_proportional(self):
-        srast = sgs.stratify.quantiles(self.rast, quantiles={"zq90": 8})
+    def test_queinnec_allocation_proportional(self, mraster, access_vect):
+        srast = self.get_srast(mraster, 8)
 
         #without mindist or access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast, 
             band='strat_zq90',
             num_samples=500,
             num_strata=8,
             allocation="prop",
             method="Queinnec"
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) == 500
         self.check_points_in_bounds(srast, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.125 == pytest.approx(0, abs=0.03)
+        np.testing.assert_allclose(list(percentages.values()), 0.125, rtol=0, atol=0.03)
 
         #with mindist
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
@@ -492,62 +376,59 @@ class TestStrat:
             allocation="prop",
             method="Queinnec",
             mindist=150,
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
         
         assert len(samples) > 490 #mindist means we may not get the full 500 
         self.check_points_in_bounds(srast, samples)
         self.check_mindist(150, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.125 == pytest.approx(0, abs=0.03)
+        np.testing.assert_allclose(list(percentages.values()), 0.125, rtol=0, atol=0.03)
 
         #with access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
             num_strata=8,
             allocation="prop",
             method = "Queinnec",
-            access = self.access,
+            access = access_vect,
             layer_name = 'access',
             buff_inner = 90,
             buff_outer = 300,
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) == 500
         self.check_points_in_bounds(srast, samples)
         self.check_access(samples, 90, 300)
         percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.125 == pytest.approx(0, abs=0.03)
+        np.testing.assert_allclose(list(percentages.values()), 0.125, rtol=0, atol=0.03)
 
         #with access and mindist
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=128,
             num_strata=8,
             allocation="prop",
             method="Queinnec",
-            access = self.access,
+            access = access_vect,
             layer_name = 'access',
             buff_outer=600,
             mindist=90,
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) > 115 #mindist means we may not get the full 128 
         self.check_points_in_bounds(srast, samples)
         self.check_access(samples, 0, 600)
         self.check_mindist(90, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        for percentage in percentages.values():
-            assert percentage - 0.125 == pytest.approx(0, abs=0.03)
+        np.testing.assert_allclose(list(percentages.values()), 0.125, rtol=0, atol=0.03)
 
-    def test_queinnec_allocation_manual(self):
+    def test_queinnec_allocation_manual(self, mraster, access_vect):
         #without mindist or access
-        srast = sgs.stratify.quantiles(self.rast, quantiles={"zq90": 4})
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        srast = self.get_srast(mraster, 4)
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
@@ -555,18 +436,16 @@ class TestStrat:
             allocation="manual",
             method="Queinnec",
             weights=[0.5, 0.25, 0.1, 0.15],
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) == 500
         self.check_points_in_bounds(srast, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        assert percentages[0] - 0.5 == pytest.approx(0, abs=0.03)
-        assert percentages[1] - 0.25 == pytest.approx(0, abs=0.03)
-        assert percentages[2] - 0.1 == pytest.approx(0, abs=0.03)
-        assert percentages[3] - 0.15 == pytest.approx(0, abs=0.03)
+        actual = [percentages[i] for i in range(4)]
+        np.testing.assert_allclose(actual, [0.5, 0.25, 0.1, 0.15], rtol=0, atol=0.03)
 
         #with mindist
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=100,
@@ -575,19 +454,17 @@ class TestStrat:
             method="Queinnec",
             weights=[0.5, 0.25, 0.1, 0.15],
             mindist=90,
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) > 90 #mindist means we may not get the full 100 
         self.check_points_in_bounds(srast, samples)
         self.check_mindist(90, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        assert percentages[0] - 0.5 == pytest.approx(0, abs=0.03)
-        assert percentages[1] - 0.25 == pytest.approx(0, abs=0.03)
-        assert percentages[2] - 0.1 == pytest.approx(0, abs=0.03)
-        assert percentages[3] - 0.15 == pytest.approx(0, abs=0.03)
+        actual = [percentages[i] for i in range(4)]
+        np.testing.assert_allclose(actual, [0.5, 0.25, 0.1, 0.15], rtol=0, atol=0.03)
 
         #with access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=100,
@@ -595,23 +472,21 @@ class TestStrat:
             allocation="manual",
             method="Queinnec",
             weights=[0.5, 0.25, 0.1, 0.15],
-            access=self.access,
+            access=access_vect,
             layer_name='access',
             buff_inner=120,
             buff_outer=1200,
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) == 100
         self.check_points_in_bounds(srast, samples)
         self.check_access(samples, 120, 1200)
         percentages = self.get_allocation_percentages(srast, samples)
-        assert percentages[0] - 0.5 == pytest.approx(0, abs=0.03)
-        assert percentages[1] - 0.25 == pytest.approx(0, abs=0.03)
-        assert percentages[2] - 0.1 == pytest.approx(0, abs=0.03)
-        assert percentages[3] - 0.15 == pytest.approx(0, abs=0.03)
+        actual = [percentages[i] for i in range(4)]
+        np.testing.assert_allclose(actual, [0.5, 0.25, 0.1, 0.15], rtol=0, atol=0.03)
 
         #with mindist and access
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=100,
@@ -619,229 +494,166 @@ class TestStrat:
             allocation="manual",
             method="Queinnec",
             weights=[0.5, 0.25, 0.1, 0.15],
-            access=self.access,
+            access=access_vect,
             layer_name='access',
             buff_outer=1200,
             mindist=90
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) > 90 #mindist means we may not get the full 100 
         self.check_points_in_bounds(srast, samples)
         self.check_access(samples, 0, 1200)
         self.check_mindist(90, samples)
         percentages = self.get_allocation_percentages(srast, samples)
-        assert percentages[0] - 0.5 == pytest.approx(0, abs=0.03)
-        assert percentages[1] - 0.25 == pytest.approx(0, abs=0.03)
-        assert percentages[2] - 0.1 == pytest.approx(0, abs=0.03)
-        assert percentages[3] - 0.15 == pytest.approx(0, abs=0.03)
+        actual = [percentages[i] for i in range(4)]
+        np.testing.assert_allclose(actual, [0.5, 0.25, 0.1, 0.15], rtol=0, atol=0.03)
 
-    def test_queinnec_allocation_optim(self):
+    def test_queinnec_allocation_optim(self, mraster):
         #test with mrast band = 0
-        srast = sgs.stratify.quantiles(self.rast, quantiles={"zq90": 10})
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        srast = self.get_srast(mraster, 10)
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
             num_strata=10,
             allocation="optim",
-            mrast=self.rast,
+            mrast=mraster,
             mrast_band=0,
             method="Queinnec",
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
         assert len(samples) == 500
         self.check_points_in_bounds(srast, samples)
         percentages = self.get_allocation_percentages(srast, samples)
         
         #these percentages have already been pre-calculated
-        assert percentages[0] - .18 == pytest.approx(0, abs=0.02)
-        assert percentages[1] - .12 == pytest.approx(0, abs=0.02)
-        assert percentages[2] - .10 == pytest.approx(0, abs=0.02)
-        assert percentages[3] - .07 == pytest.approx(0, abs=0.02)
-        assert percentages[4] - .06 == pytest.approx(0, abs=0.02)
-        assert percentages[5] - .05 == pytest.approx(0, abs=0.02)
-        assert percentages[6] - .05 == pytest.approx(0, abs=0.02)
-        assert percentages[7] - .04 == pytest.approx(0, abs=0.02)
-        assert percentages[8] - .07 == pytest.approx(0, abs=0.02)
-        assert percentages[9] - .26 == pytest.approx(0, abs=0.02)
+        actual = [percentages[i] for i in range(10)]
+        np.testing.assert_allclose(actual, [.18, .12, .10, .07, .06, .05, .05, .04, .07, .26], rtol=0, atol=0.02)
        
         #test with mrast band = 1
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
             num_strata=10,
             allocation="optim",
-            mrast=self.rast,
+            mrast=mraster,
             mrast_band=1,
             method="Queinnec",
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
     
         assert len(samples) == 500
         self.check_points_in_bounds(srast, samples)
         percentages = self.get_allocation_percentages(srast, samples)
         
         #these percentages have already been pre-calculated
-        assert percentages[0] - .12 == pytest.approx(0, abs=0.02)
-        assert percentages[1] - .15 == pytest.approx(0, abs=0.02)
-        assert percentages[2] - .14 == pytest.approx(0, abs=0.02)
-        assert percentages[3] - .11 == pytest.approx(0, abs=0.02)
-        assert percentages[4] - .10 == pytest.approx(0, abs=0.02)
-        assert percentages[5] - .09 == pytest.approx(0, abs=0.02)
-        assert percentages[6] - .08 == pytest.approx(0, abs=0.02)
-        assert percentages[7] - .07 == pytest.approx(0, abs=0.02)
-        assert percentages[8] - .07 == pytest.approx(0, abs=0.02)
-        assert percentages[9] - .07 == pytest.approx(0, abs=0.02)
-
-    def test_existing_samples(self):
+        actual = [percentages[i] for i in range(10)]
+        np.testing.assert_allclose(actual, [.12, .15, .14, .11, .10, .09, .08, .07, .07, .07], rtol=0, atol=0.02)
+
+    def test_existing_samples(self, mraster, existing_vect):
         #with force=True, test a couple different combinations of input parameters
-        srast = sgs.stratify.quantiles(self.rast, quantiles={"zq90": 10})
+        srast = self.get_srast(mraster, 10)
         existing = gpd.read_file(existing_shapefile_path)['geometry']
         existing_sample_count = len(existing)
 
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=100,
             num_strata=10,
-            existing=self.existing,
+            existing=existing_vect,
             force=True,
             allocation="optim",
-            mrast=self.rast,
+            mrast=mraster,
             mrast_band=0,
             method="random"
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
-        for sample in existing:
-            assert samples.contains(sample).any()
+        assert self.count_existing_in_samples(existing, samples) == existing_sample_count
 
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
             num_strata=10,
-            existing=self.existing,
+            existing=existing_vect,
             force=True,
             allocation="optim",
-            mrast=self.rast,
+            mrast=mraster,
             mrast_band=0,
             method="Queinnec"
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
-        for sample in existing:
-            assert samples.contains(sample).any()
+        assert self.count_existing_in_samples(existing, samples) == existing_sample_count
 
         #with force=False, test a couple different combinations of input parameters
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=100,
             num_strata=10,
-            existing=self.existing,
+            existing=existing_vect,
             force=False,
             allocation="optim",
-            mrast=self.rast,
+            mrast=mraster,
             mrast_band=0,
             method="random"
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
     
-        existing_in_final = 0
-        for sample in existing:
-            if samples.contains(sample).any():
-                existing_in_final += 1
+        existing_in_final = self.count_existing_in_samples(existing, samples)
 
         assert existing_in_final != 0
         assert existing_in_final != existing_sample_count
 
-        samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
             srast,
             band='strat_zq90',
             num_samples=500,
             num_strata=10,
-            existing=self.existing,
+            existing=existing_vect,
             force=False,
             allocation="manual",
             weights=[0.11, 0.11, 0.11, 0.11, 0.11, 0.11, 0.11, 0.11, 0.11, .01],
-            mrast=self.rast,
+            mrast=mraster,
             mrast_band=0,
             method="Queinnec"
-        ).samples_as_wkt())
+        ).samples_as_xy().T)
 
-        existing_in_final = 0
-        for sample in existing:
-            if samples.contains(sample).any():
-                existing_in_final += 1
+        existing_in_final = self.count_existing_in_samples(existing, samples)
 
         assert existing_in_final != 0
         assert existing_in_final != existing_sample_count
 
-    def test_queinnec_focal_window(self):
-        srast = sgs.stratify.quantiles(self.rast, quantiles={"zq90": 5})
+    #3x3 windows are easier to fill, so fewer runs with more samples each are used for them
+    @pytest.mark.parametrize("wrow, wcol, num_samples, runs", [
+        (3, 3, 50, 20),
+        (5, 5, 5, 100),
+        (3, 5, 5, 100),
+        (5, 3, 5, 100),
+    ])
+    def test_queinnec_focal_window(self, mraster, wrow, wcol, num_samples, runs):
+        srast = self.get_srast(mraster, 5)
 
         #queinnec sampling works by first adding pixels which have a focal
         #window containing the same pixels, then automatically moving to 
         #random sampling if required. To test the focal window calculation
         #adequately while not forcing the algorithm to move to random sampling,
         #sampling a small amount of pixels, but doing it repeatedly.
-
-        #test 3x3 focal window
-        for _ in range(20):
-            samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
-                srast,
-                band='strat_zq90',
-                num_samples=50,
-                num_strata=5,
-                wrow=3,
-                wcol=3,
-                allocation="equal",
-                method="Queinnec",
-            ).samples_as_wkt())
-            self.check_focal_window(srast, samples, 3, 3)
-
-        #test 5x5 focal window
-        for _ in range(100):
-            samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
-                srast,
-                band='strat_zq90',
-                num_samples=5,
-                num_strata=5,
-                wrow=5,
-                wcol=5,
-                allocation="equal",
-                method="Queinnec",
-            ).samples_as_wkt())
-            self.check_focal_window(srast, samples, 5, 5)
-
-        #test 3x5 focal window
-        for _ in range(100):
-            samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
+        for _ in range(runs):
+            samples = gpd.GeoSeries.from_xy(*sgs.sample.strat(
                 srast,
                 band='strat_zq90',
-                num_samples=5,
+                num_samples=num_samples,
                 num_strata=5,
-                wrow=3,
-                wcol=5,
+                wrow=wrow,
+                wcol=wcol,
                 allocation="equal",
                 method="Queinnec",
-            ).samples_as_wkt())
-            self.check_focal_window(srast, samples, wrow=3, wcol=5)
+            ).samples_as_xy().T)
+            self.check_focal_window(srast, samples, wrow, wcol)
 
-        #test 5x3 focal window
-        for _ in range(100):
-            samples = gpd.GeoSeries.from_wkt(sgs.sample.strat(
-                srast,
-                band='strat_zq90',
-                num_samples=5,
-                num_strata=5,
-                wrow=5,
-                wcol=3,
-                allocation="equal",
-                method="Queinnec",
-            ).samples_as_wkt())
-            self.check_focal_window(srast, samples, wrow=5, wcol=3)
- 
-    def test_function_inputs(self):
-        srast = sgs.stratify.quantiles(self.rast, quantiles={"zq90": 5})
+    def test_function_inputs(self, mraster):
+        srast = self.get_srast(mraster, 5)
 
         #test wrow inputs
         for wrow in [-1, 0, 2]:
@@ -1,5 +1,3 @@
-import warnings
-
 import numpy as np
 import geopandas as gpd
 import pytest
@@ -7,143 +5,109 @@ import pytest
 import sgspy as sgs
 
 from files import (
-    mraster_geotiff_path,
     access_shapefile_path,
     existing_shapefile_path
 )
 
 class TestSystematic:
-    rast = sgs.SpatialRaster(mraster_geotiff_path)
-
-    access = sgs.SpatialVector(access_shapefile_path)
-    existing = sgs.SpatialVector(existing_shapefile_path)
-
-    def check_samples(self, samples):
-        for sample in samples:
-            assert sample.x >= self.rast.xmin
-            assert sample.x <= self.rast.xmax
-            assert sample.y >= self.rast.ymin
-            assert sample.y <= self.rast.ymax
-
-    def test_points_in_correct_area(self):
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 30, "square", "centers").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 30, "hexagon", "centers").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 30, "square", "corners").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 30, "hexagon", "corners").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 30, "square", "random").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 30, "hexagon", "random").samples_as_wkt())
-        self.check_samples(samples)
-
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 500, "square", "centers").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 500, "hexagon", "centers").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 500, "square", "corners").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 500, "hexagon", "corners").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 500, "square", "random").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 500, "hexagon", "random").samples_as_wkt())
-        self.check_samples(samples)
-
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 3000, "square", "centers").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 3000, "hexagon", "centers").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 3000, "square", "corners").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 3000, "hexagon", "corners").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 3000, "square", "random").samples_as_wkt())
-        self.check_samples(samples)
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 3000, "hexagon", "random").samples_as_wkt())
-        self.check_samples(samples)
-
-    def test_inputs(self):
-        sgs.systematic(self.rast, 100)
-        sgs.systematic(self.rast, 100, "square", "centers")
-        sgs.systematic(self.rast, 100, "hexagon", "random")
+    #the existing points and accessible area only ever get read by the tests, so they're only loaded once
+    existing_xy = gpd.read_file(existing_shapefile_path).get_coordinates().to_numpy()
+    accessible = gpd.read_file(access_shapefile_path).buffer(120).union_all()
+
+    def check_samples(self, rast, samples):
+        #samples is an (n, 2) array of x, y coordinates, no geometries are needed for a bounds check
+        xs = samples[:, 0]
+        ys = samples[:, 1]
+        assert np.all((xs >= rast.xmin) & (xs <= rast.xmax))
+        assert np.all((ys >= rast.ymin) & (ys <= rast.ymax))
+
+    def check_existing(self, samples):
+        #samples is an (n, 2) array of x, y coordinates. Existing points are copied into
+        #the output as they are, so each one must exactly match the coordinates of a sample
+        matches = (self.existing_xy[:, None, :] == samples[None, :, :]).all(axis=2)
+        assert matches.any(axis=1).all()
+
+    #the smallest cellsize generates by far the most samples, so it's run on the small raster
+    @pytest.mark.parametrize("raster, cellsize", [("mraster_small", 30), ("mraster", 500), ("mraster", 3000)])
+    @pytest.mark.parametrize("shape", ["square", "hexagon"])
+    @pytest.mark.parametrize("location", ["centers", "corners", "random"])
+    def test_points_in_correct_area(self, request, raster, cellsize, shape, location):
+        rast = request.getfixturevalue(raster)
+        self.check_samples(rast, sgs.systematic(rast, cellsize, shape, location).samples_as_xy())
+
+    def test_inputs(self, mraster):
+        sgs.systematic(mraster, 100)
+        sgs.systematic(mraster, 100, "square", "centers")
+        sgs.systematic(mraster, 100, "hexagon", "random")
 
         with pytest.raises(ValueError):
-            sgs.systematic(self.rast, -1, "square", "centers")
+            sgs.systematic(mraster, -1, "square", "centers")
 
         with pytest.raises(ValueError):
-            sgs.systematic(self.rast, 0, "square", "centers")
+            sgs.systematic(mraster, 0, "square", "centers")
 
         with pytest.raises(ValueError):
-            sgs.systematic(self.rast, 100, "", "centers")
+            sgs.systematic(mraster, 100, "", "centers")
 
         with pytest.raises(ValueError):
-            sgs.systematic(self.rast, 100, "square", "")
+            sgs.systematic(mraster, 100, "square", "")
 
         with pytest.raises(ValueError):
-            sgs.systematic(self.rast, 100, "square", "center")
+            sgs.systematic(mraster, 100, "square", "center")
 
         with pytest.raises(ValueError):
-            sgs.systematic(self.rast, 100, "squares", "centers")
+            sgs.systematic(mraster, 100, "squares", "centers")
 
-    def test_write(self, tmp_path):
+    def test_write(self, tmp_path, mraster):
         temp_dir = tmp_path / "test_output"
         temp_dir.mkdir()
         temp_file = temp_dir / "vect.shp"
 
-        gs_samples = sgs.systematic(self.rast, 500, "hexagon", "centers", filename=str(temp_file)).to_geopandas()['geometry']
+        gs_samples = sgs.systematic(mraster, 500, "hexagon", "centers", filename=str(temp_file)).to_geopandas()['geometry']
         gs_file = gpd.read_file(temp_file)
 
-        # on linux, the following throws a warning about the spatial references differing by:
-        # UTM Zone 17, Northern Hemisphere vs UTM_Zone_17_Northern_Hemisphere
-        # which shouldn't cause any kind of problem
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            assert len(gs_samples.intersection(gs_file)) == len(gs_samples)
-
-    def test_existing(self):
-        existing = gpd.read_file(existing_shapefile_path)['geometry']
+        #compare the point coordinates directly, sorted so that feature order doesn't matter
+        test = gs_file.get_coordinates().to_numpy()
+        correct = gs_samples.get_coordinates().to_numpy()
+        assert len(test) == len(correct)
+        np.testing.assert_allclose(test[np.lexsort(test.T)], correct[np.lexsort(correct.T)])
 
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "square", "centers", existing=self.existing).samples_as_wkt())
-        for sample in existing: assert samples.contains(sample).any()
+    def test_existing(self, mraster, existing_vect):
+        samples = sgs.systematic(mraster, 300, "square", "centers", existing=existing_vect).samples_as_xy()
+        self.check_existing(samples)
 
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "hexagon", "centers", existing=self.existing).samples_as_wkt())
-        for sample in existing: assert samples.contains(sample).any()
+        samples = sgs.systematic(mraster, 300, "hexagon", "centers", existing=existing_vect).samples_as_xy()
+        self.check_existing(samples)
         
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "square", "corners", existing=self.existing).samples_as_wkt())
-        for sample in existing: assert samples.contains(sample).any()
+        samples = sgs.systematic(mraster, 300, "square", "corners", existing=existing_vect).samples_as_xy()
+        self.check_existing(samples)
         
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "hexagon", "corners", existing=self.existing).samples_as_wkt())
-        for sample in existing: assert samples.contains(sample).any()
+        samples = sgs.systematic(mraster, 300, "hexagon", "corners", existing=existing_vect).samples_as_xy()
+        self.check_existing(samples)
         
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "square", "random", existing=self.existing).samples_as_wkt())
-        for sample in existing: assert samples.contains(sample).any()
+        samples = sgs.systematic(mraster, 300, "square", "random", existing=existing_vect).samples_as_xy()
+        self.check_existing(samples)
         
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "hexagon", "random", existing=self.existing).samples_as_wkt())
-        for sample in existing: assert samples.contains(sample).any()
-
+        samples = sgs.systematic(mraster, 300, "hexagon", "random", existing=existing_vect).samples_as_xy()
+        self.check_existing(samples)
 
-    def test_access(self):
-        gs_access = gpd.read_file(access_shapefile_path)
-        accessible = gs_access.buffer(120).union_all()
 
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "square", "centers", access=self.access, buff_outer=120).samples_as_wkt())
-        for sample in samples: assert accessible.contains(sample)
+    def test_access(self, mraster, access_vect):
+        samples = gpd.GeoSeries.from_xy(*sgs.systematic(mraster, 300, "square", "centers", access=access_vect, buff_outer=120).samples_as_xy().T)
+        assert samples.within(self.accessible).all()
 
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "hexagon", "centers", access=self.access, buff_outer=120).samples_as_wkt())
-        for sample in samples: assert accessible.contains(sample)
+        samples = gpd.GeoSeries.from_xy(*sgs.systematic(mraster, 300, "hexagon", "centers", access=access_vect, buff_outer=120).samples_as_xy().T)
+        assert samples.within(self.accessible).all()
         
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "square", "corners", access=self.access, buff_outer=120).samples_as_wkt())
-        for sample in samples: assert accessible.contains(sample)
+        samples = gpd.GeoSeries.from_xy(*sgs.systematic(mraster, 300, "square", "corners", access=access_vect, buff_outer=120).samples_as_xy().T)
+        assert samples.within(self.accessible).all()
         
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "hexagon", "corners", access=self.access, buff_outer=120).samples_as_wkt())
-        for sample in samples: assert accessible.contains(sample)
+        samples = gpd.GeoSeries.from_xy(*sgs.systematic(mraster, 300, "hexagon", "corners", access=access_vect, buff_outer=120).samples_as_xy().T)
+        assert samples.within(self.accessible).all()
         
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "square", "random", access=self.access, buff_outer=120).samples_as_wkt())
-        for sample in samples: assert accessible.contains(sample)
+        samples = gpd.GeoSeries.from_xy(*sgs.systematic(mraster, 300, "square", "random", access=access_vect, buff_outer=120).samples_as_xy().T)
+        assert samples.within(self.accessible).all()
         
-        samples = gpd.GeoSeries.from_wkt(sgs.systematic(self.rast, 300, "hexagon", "random", access=self.access, buff_outer=120).samples_as_wkt())
-        for sample in samples: assert accessible.contains(sample)
+        samples = gpd.GeoSeries.from_xy(*sgs.systematic(mraster, 300, "hexagon", "random", access=access_vect, buff_outer=120).samples_as_xy().T)
+        assert samples.within(self.accessible).all()
 
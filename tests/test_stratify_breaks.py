@@ -3,86 +3,103 @@ import numpy as np
 
 import sgspy as sgs
 
+from checks import check_mapping
 from files import (
-    mraster_geotiff_path,
-    sraster_geotiff_path,
     strat_breaks_zq90_r_path,
     strat_breaks_pz2_r_path,
 )
 
 class TestBreaks:
-    #input raster
-    rast = sgs.SpatialRaster(mraster_geotiff_path)
-    single_band_rast = sgs.SpatialRaster(sraster_geotiff_path)
-
     #output rasters from running through R version
     zq90_output_rast = sgs.SpatialRaster(strat_breaks_zq90_r_path)
     pz2_output_rast = sgs.SpatialRaster(strat_breaks_pz2_r_path)
 
-    def test_correct_stratifications_against_R_version(self):
-        test_rast = sgs.breaks(self.rast, breaks={'zq90': [3, 5, 11, 18]})
+    #the R version numbers strata from 1 and uses nan as nodata, where this version numbers
+    #from 0 and uses -1.
+    zq90_correct = np.nan_to_num(np.subtract(zq90_output_rast.band(0), 1), nan=-1)
+    pz2_correct = np.nan_to_num(np.subtract(pz2_output_rast.band(0), 1), nan=-1)
+
+    def test_correct_stratifications_against_R_version(self, mraster):
+        test_rast = sgs.breaks(mraster, breaks={'zq90': [3, 5, 11, 18]})
         test = test_rast.band('strat_zq90')
-        correct = np.nan_to_num(np.subtract(self.zq90_output_rast.band(0), 1), nan=-1)
-        assert np.array_equal(test, correct, equal_nan=True)
+        assert np.array_equal(test, self.zq90_correct)
 
-        test_rast = sgs.breaks(self.rast, breaks={'pzabove2': [20, 40, 60, 80]}) #pzabove2
+        test_rast = sgs.breaks(mraster, breaks={'pzabove2': [20, 40, 60, 80]}) #pzabove2
         test = test_rast.band(0)
-        correct = np.nan_to_num(np.subtract(self.pz2_output_rast.band(0), 1), nan=-1)
-        assert np.array_equal(test, correct, equal_nan=True)
+        assert np.array_equal(test, self.pz2_correct)
             
-    def test_mapping_outputs(self):
+    def test_mapping_outputs(self, mraster):
         #the python version maps variables differently than the R version
         #so rather than compare against the R version, I'm going to ensure
         #that each mapping stratification corresponds to one single stratification
         #in each of the non-mapping stratifications
-        zq90_mapping = {}
-        pz2_mapping = {}
-        zsd_mapping = {}
-        
-        test_rast = sgs.breaks(self.rast, breaks=[[3, 5, 11, 18], [40, 60, 80], [2, 5]], map=True)
-        
-        zq90_band = test_rast.band('strat_zq90')
-        pz2_band = test_rast.band('strat_pzabove2')
-        zsd_band = test_rast.band('strat_zsd')
-        map_band = test_rast.band('strat_map')
-
-        for i in range(test_rast.height):
-            for j in range(test_rast.width):
-                zq90_strat = zq90_band[i, j]
-                pz2_strat = pz2_band[i, j]
-                zsd_strat = zsd_band[i, j]
-                map_strat = map_band[i, j]
-
-                if map_strat in zq90_mapping:
-                    assert zq90_mapping[map_strat] == zq90_strat
-                    assert pz2_mapping[map_strat] == pz2_strat
-                    assert zsd_mapping[map_strat] == zsd_strat
-                else:
-                    zq90_mapping[map_strat] = zq90_strat
-                    pz2_mapping[map_strat] = pz2_strat
-                    zsd_mapping[map_strat] = zsd_strat
-
-    def test_breaks_inputs(self):
+        test_rast = sgs.breaks(mraster, breaks=[[3, 5, 11, 18], [40, 60, 80], [2, 5]], map=True)
+
+        check_mapping(
+            test_rast.band('strat_map'),
+            test_rast.band('strat_zq90'),
+            test_rast.band('strat_pzabove2'),
+            test_rast.band('strat_zsd'),
+        )
+
+    def test_breaks_inputs(self, mraster, sraster):
         #ensuring no errors with single band input
-        test_rast = sgs.breaks(self.single_band_rast, breaks=[1,3])
-        test_rast = sgs.breaks(self.single_band_rast, breaks=[1])
+        test_rast = sgs.breaks(sraster, breaks=[1,3])
+        test_rast = sgs.breaks(sraster, breaks=[1])
 
         with pytest.raises(ValueError):
-            test_rast = sgs.breaks(self.rast, breaks=[2, 5])
+            test_rast = sgs.breaks(mraster, breaks=[2, 5])
 
         with pytest.raises(ValueError):
-            test_rast = sgs.breaks(self.single_band_rast, breaks=[[3, 5, 11, 18], [2, 5]])
+            test_rast = sgs.breaks(sraster, breaks=[[3, 5, 11, 18], [2, 5]])
         
         with pytest.raises(ValueError):
-            test_rast = sgs.breaks(self.single_band_rast, breaks=[])
+            test_rast = sgs.breaks(sraster, breaks=[])
 
-    def test_write_functionality(self, tmp_path):
+        with pytest.raises(ValueError):
+            test_rast = sgs.breaks(sraster, breaks=[1, 3], compress='jpeg')
+
+        with pytest.raises(TypeError):
+            test_rast = sgs.breaks(sraster, breaks=[1, 3], overviews=1)
+
+    def test_write_functionality(self, tmp_path, mraster):
         temp_dir = tmp_path / "test_out"
         temp_dir.mkdir()
 
         temp_file = temp_dir / "rast.tif"
-        sgs.breaks(self.rast, breaks={'zq90': [3, 5, 11, 18]}, filename=str(temp_file))
+        sgs.breaks(mraster, breaks={'zq90': [3, 5, 11, 18]}, filename=str(temp_file))
+        test_rast = sgs.SpatialRaster(str(temp_file))
+        test = test_rast.band('strat_zq90')
+        assert np.array_equal(test, self.zq90_correct)
+
+        #uncompressed output should contain the same values
+        temp_file = temp_dir / "rast_uncompressed.tif"
+        sgs.breaks(mraster, breaks={'zq90': [3, 5, 11, 18]}, filename=str(temp_file), compress='none')
+        test_rast = sgs.SpatialRaster(str(temp_file))
+        test = test_rast.band('strat_zq90')
+        assert np.array_equal(test, self.zq90_correct)
+
+        #deflate output should contain the same values
+        temp_file = temp_dir / "rast_deflate.tif"
+        sgs.breaks(mraster, breaks={'zq90': [3, 5, 11, 18]}, filename=str(temp_file), compress='deflate')
+        test_rast = sgs.SpatialRaster(str(temp_file))
+        test = test_rast.band('strat_zq90')
+        assert np.array_equal(test, self.zq90_correct)
+
+    def test_overviews(self, tmp_path, mraster):
+        gdal = pytest.importorskip("osgeo.gdal")
+
+        #overviews are only built by default for large rasters
+        temp_file = tmp_path / "rast.tif"
+        sgs.breaks(mraster, breaks={'zq90': [3, 5, 11, 18]}, filename=str(temp_file))
+        assert gdal.Open(str(temp_file)).GetRasterBand(1).GetOverviewCount() == 0
+
+        #levels 2 and 4 are built, the next level would be smaller than 64 pixels
+        temp_file = tmp_path / "rast_overviews.tif"
+        sgs.breaks(mraster, breaks={'zq90': [3, 5, 11, 18]}, filename=str(temp_file), overviews=True)
+        assert gdal.Open(str(temp_file)).GetRasterBand(1).GetOverviewCount() == 2
+
+        #building overviews should not change the full resolution values
         test_rast = sgs.SpatialRaster(str(temp_file))
         test = test_rast.band('strat_zq90')
-        correct = np.nan_to_num(np.subtract(self.zq90_output_rast.band(0), 1), nan=-1)
-        assert np.array_equal(test, correct, equal_nan=True)
+        assert np.array_equal(test, self.zq90_correct)
@@ -2,47 +2,31 @@ import pytest
 
 import sgspy as sgs
 
-from files import mraster_geotiff_path
+from checks import check_mapping
 
-class TestMap:
-    rast = sgs.SpatialRaster(mraster_geotiff_path)
-
-    def test_correct_outputs(self):
-        zq90_mapping = {}
-        pz2_mapping = {}
-        zsd_mapping = {}
+#input stratifications shared by every test in the module
+@pytest.fixture(scope="module")
+def breaks(mraster):
+    return sgs.breaks(mraster, breaks={'zq90': [3, 5, 11, 18], 'pzabove2': [20, 40, 60, 80]})
 
-        breaks = sgs.breaks(self.rast, breaks={'zq90': [3, 5, 11, 18], 'pzabove2': [20, 40, 60, 80]})
-        quantiles = sgs.quantiles(self.rast, quantiles={'zsd': 25})
-        zq90_rast = breaks.band('strat_zq90')
-        pz2_rast = breaks.band('strat_pzabove2')
-        zsd_rast = quantiles.band('strat_zsd')
+@pytest.fixture(scope="module")
+def quantiles(mraster):
+    return sgs.quantiles(mraster, quantiles={'zsd': 25})
 
+class TestMap:
+    def test_correct_outputs(self, breaks, quantiles):
         mapped = sgs.map((breaks, ['strat_zq90', 'strat_pzabove2'], [5, 5]), (quantiles, 'strat_zsd', 25))
         
         assert mapped.height == breaks.height
         assert mapped.width == breaks.width
-        for i in range(mapped.height):
-            for j in range(mapped.width):
-                zq90_strat = zq90_rast[i, j]
-                pz2_strat = pz2_rast[i, j]
-                zsd_strat = zsd_rast[i, j]
-                map_strat = mapped.band('strat_map')[i, j]
-
-                if map_strat in zq90_mapping:
-                    assert zq90_mapping[map_strat] == zq90_strat
-                    assert pz2_mapping[map_strat] == pz2_strat
-                    assert zsd_mapping[map_strat] == zsd_strat
-                else:
-                    zq90_mapping[map_strat] = zq90_strat
-                    pz2_mapping[map_strat] = pz2_strat
-                    zsd_mapping[map_strat] = zsd_strat
-
-
-    def test_inputs(self):
-        breaks = sgs.breaks(self.rast, breaks={'zq90': [3, 5, 11, 18], 'pzabove2': [20, 40, 60, 80]})
-        quantiles = sgs.quantiles(self.rast, quantiles={'zsd': 25})
-        
+        check_mapping(
+            mapped.band('strat_map'),
+            breaks.band('strat_zq90'),
+            breaks.band('strat_pzabove2'),
+            quantiles.band('strat_zsd'),
+        )
+
+    def test_inputs(self, breaks):
         #no error when passed as ints
         mapped = sgs.map((breaks, [0, 1], [5, 5]))
 
@@ -55,17 +39,7 @@ class TestMap:
         with pytest.raises(ValueError):
             mapped = sgs.map((breaks, [1, 2], [5, 5]))
 
-    def test_write_functionality(self, tmp_path):
-        zq90_mapping = {}
-        pz2_mapping = {}
-        zsd_mapping = {}
-
-        breaks = sgs.breaks(self.rast, breaks={'zq90': [3, 5, 11, 18], 'pzabove2': [20, 40, 60, 80]})
-        quantiles = sgs.quantiles(self.rast, quantiles={'zsd': 25})
-        zq90_rast = breaks.band('strat_zq90')
-        pz2_rast = breaks.band('strat_pzabove2')
-        zsd_rast = quantiles.band('strat_zsd')
-
+    def test_write_functionality(self, tmp_path, breaks, quantiles):
         temp_dir = tmp_path / "test_out"
         temp_dir.mkdir()
 
@@ -75,18 +49,9 @@ class TestMap:
 
         assert mapped.height == breaks.height
         assert mapped.width == breaks.width
-        for i in range(mapped.height):
-            for j in range(mapped.width):
-                zq90_strat = zq90_rast[i, j]
-                pz2_strat = pz2_rast[i, j]
-                zsd_strat = zsd_rast[i, j]
-                map_strat = mapped.band('strat_map')[i, j]
-
-                if map_strat in zq90_mapping:
-                    assert zq90_mapping[map_strat] == zq90_strat
-                    assert pz2_mapping[map_strat] == pz2_strat
-                    assert zsd_mapping[map_strat] == zsd_strat
-                else:
-                    zq90_mapping[map_strat] = zq90_strat
-                    pz2_mapping[map_strat] = pz2_strat
-                    zsd_mapping[map_strat] = zsd_strat
+        check_mapping(
+            mapped.band('strat_map'),
+            breaks.band('strat_zq90'),
+            breaks.band('strat_pzabove2'),
+            quantiles.band('strat_zsd'),
+        )
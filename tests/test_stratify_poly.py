@@ -4,68 +4,56 @@ import numpy as np
 import sgspy as sgs
 
 from files import (
-    mraster_geotiff_path,
-    inventory_polygons_shapefile_path,
     strat_poly_test1_r_path,
     strat_poly_test2_r_path,
 )
 
-class TestPoly:
-    #inputs
-    rast = sgs.SpatialRaster(mraster_geotiff_path)
-    vect = sgs.SpatialVector(inventory_polygons_shapefile_path)
+def convert_r_output(band):
+    #the R version numbers strata from 1 and uses 4294967295 as nodata, where
+    #this version numbers from 0 and uses nan. The nodata mask is taken on the
+    #uint32 values, since float32 can't represent 4294967295 exactly.
+    nodata = band == np.uint32(4294967295)
+    correct = band.astype(np.float32)
+    correct -= 1
+    correct[nodata] = np.nan
+    return correct
 
-    #output rasters
-    test1_output_rast = sgs.SpatialRaster(strat_poly_test1_r_path)
-    test2_output_rast = sgs.SpatialRaster(strat_poly_test2_r_path)
+#output rasters from running through R version, converted once since they're only ever read
+test1_correct = convert_r_output(sgs.SpatialRaster(strat_poly_test1_r_path).band(0))
+test2_correct = convert_r_output(sgs.SpatialRaster(strat_poly_test2_r_path).band(0))
 
-    def test_correct_stratifications_against_R_version(self):
-        test_rast = sgs.poly(
-            self.rast, 
-            self.vect, 
-            attribute='NUTRIENTS', 
-            layer_name='inventory_polygons',
-            features=['poor', 'rich', 'medium'],
-        )
+class TestPoly:
+    def get_test_band(self, test_rast):
         test = test_rast.band(0).astype(np.float32)
         test[test == -1] = np.nan
-        correct = self.test1_output_rast.band(0).astype(np.float32)
-        correct[correct == 4294967295] = np.nan
-        correct = np.subtract(correct, 1)
-        assert np.array_equal(test, correct, equal_nan=True)
-        
+        return test
+
+    @pytest.mark.parametrize("features, correct", [
+        (['poor', 'rich', 'medium'], test1_correct),
+        (['poor', ['rich', 'medium']], test2_correct),
+    ], ids=["separate", "grouped"])
+    def test_correct_stratifications_against_R_version(self, mraster, inventory_vect, features, correct):
         test_rast = sgs.poly(
-            self.rast,
-            self.vect,
-            attribute='NUTRIENTS',
+            mraster, 
+            inventory_vect, 
+            attribute='NUTRIENTS', 
             layer_name='inventory_polygons',
-            features=['poor', ['rich', 'medium']],
+            features=features,
         )
-        test = test_rast.band(0).astype(np.float32)
-        test[test == -1] = np.nan
-        correct = self.test2_output_rast.band(0).astype(np.float32)
-        correct[correct == 4294967295] = np.nan
-        correct = np.subtract(correct, 1)
-        assert np.array_equal(test, correct, equal_nan=True)
+        assert np.array_equal(self.get_test_band(test_rast), correct, equal_nan=True)
 
-    def test_write_functionality(self, tmp_path):
+    def test_write_functionality(self, tmp_path, mraster, inventory_vect):
         temp_dir = tmp_path / "test_out"
         temp_dir.mkdir()
 
         temp_file = temp_dir / "rast.tif"
         sgs.poly(
-            self.rast, 
-            self.vect, 
+            mraster, 
+            inventory_vect, 
             attribute='NUTRIENTS', 
             layer_name='inventory_polygons',
             features=['poor', 'rich', 'medium'],
             filename=str(temp_file),
         )
         test_rast = sgs.SpatialRaster(str(temp_file))
-        test = test_rast.band(0).astype(np.float32)
-        test[test == -1] = np.nan
-        correct = self.test1_output_rast.band(0).astype(np.float32)
-        correct[correct == 4294967295] = np.nan
-        correct = np.subtract(correct, 1)
-        assert np.array_equal(test, correct, equal_nan=True)
-
+        assert np.array_equal(self.get_test_band(test_rast), test1_correct, equal_nan=True)
@@ -3,86 +3,104 @@ import numpy as np
 
 import sgspy as sgs
 
+from checks import check_mapping
 from files import (
-    mraster_geotiff_path,
-    sraster_geotiff_path,
     strat_quantiles_zq90_r_path,
     strat_quantiles_pz2_r_path,
 )
 
 class TestQuantiles:
-    #input raster
-    rast = sgs.SpatialRaster(mraster_geotiff_path)
-    single_band_rast = sgs.SpatialRaster(sraster_geotiff_path)
-
     #output raster form running through R version
     zq90_output_rast = sgs.SpatialRaster(strat_quantiles_zq90_r_path)
     pz2_output_rast = sgs.SpatialRaster(strat_quantiles_pz2_r_path)
+
+    #the R version numbers strata from 1 and uses nan as nodata, where this version numbers
+    #from 0 and uses -1.
+    zq90_correct = np.nan_to_num(np.subtract(zq90_output_rast.band(0), 1), nan=-1)
+    pz2_correct = np.nan_to_num(np.subtract(pz2_output_rast.band(0), 1), nan=-1)
     
-    def test_correct_stratifications_against_R_version(self):
-        test_rast = sgs.quantiles(self.rast, quantiles={"zq90": 4})
+    def test_correct_stratifications_against_R_version(self, mraster):
+        test_rast = sgs.quantiles(mraster, quantiles={"zq90": 4})
         test = test_rast.band('strat_zq90')
-        correct = np.nan_to_num(np.subtract(self.zq90_output_rast.band(0), 1), nan=-1)
-        assert np.array_equal(test, correct, equal_nan=True)
+        assert np.array_equal(test, self.zq90_correct)
 
-        test_rast = sgs.quantiles(self.rast, quantiles={"pzabove2": [0.2, 0.4, 0.8]})
+        test_rast = sgs.quantiles(mraster, quantiles={"pzabove2": [0.2, 0.4, 0.8]})
         test = test_rast.band('strat_pzabove2')
-        correct = np.nan_to_num(np.subtract(self.pz2_output_rast.band(0), 1), nan=-1)
-        assert np.array_equal(test, correct, equal_nan=True)
+        assert np.array_equal(test, self.pz2_correct)
 
-    def test_mapping_outputs(self):
+    def test_mapping_outputs(self, mraster):
         #the python version maps variables differently than the R version
         #so rather than compare against the R version, I'm going to ensure
         #that each mapping stratification corresponds to one single stratification
         #in each of the non-mapping stratifications
-        zq90_mapping = {}
-        pz2_mapping = {}
-        zsd_mapping = {}
-        
-        test_rast = sgs.quantiles(self.rast, quantiles=[5, [0.2, 0.4, 0.8], 3], map=True)
-
-        for i in range(test_rast.height):
-            for j in range(test_rast.width):
-                zq90_strat = test_rast.band('strat_zq90')[i, j]
-                pz2_strat = test_rast.band('strat_pzabove2')[i, j]
-                zsd_strat = test_rast.band('strat_zsd')[i, j]
-                map_strat = test_rast.band('strat_map')[i, j]
-
-                if map_strat in zq90_mapping:
-                    assert zq90_mapping[map_strat] == zq90_strat
-                    assert pz2_mapping[map_strat] == pz2_strat
-                    assert zsd_mapping[map_strat] == zsd_strat
-                else:
-                    zq90_mapping[map_strat] = zq90_strat
-                    pz2_mapping[map_strat] = pz2_strat
-                    zsd_mapping[map_strat] = zsd_strat
-
-    def test_quantiles_inputs(self):
-        test_rast = sgs.quantiles(self.single_band_rast, quantiles=10)
-        test_rast = sgs.quantiles(self.single_band_rast, quantiles=[0.00001])
+        test_rast = sgs.quantiles(mraster, quantiles=[5, [0.2, 0.4, 0.8], 3], map=True)
 
-        with pytest.raises(ValueError):
-            test_rast = sgs.quantiles(self.single_band_rast, quantiles=[-0.000001, 0.2, 0.4, 0.7])
+        check_mapping(
+            test_rast.band('strat_map'),
+            test_rast.band('strat_zq90'),
+            test_rast.band('strat_pzabove2'),
+            test_rast.band('strat_zsd'),
+        )
 
-        with pytest.raises(ValueError):
-            test_rast = sgs.quantiles(self.single_band_rast, quantiles=[0.2, 0.4, 0.8, 1.1])
+    def test_quantiles_inputs(self, sraster):
+        test_rast = sgs.quantiles(sraster, quantiles=10)
+        test_rast = sgs.quantiles(sraster, quantiles=[0.00001])
 
         with pytest.raises(ValueError):
-            test_rast = sgs.quantiles(self.rast, quantiles=5)
+            test_rast = sgs.quantiles(sraster, quantiles=10, compress='jpeg')
 
+        with pytest.raises(TypeError):
+            test_rast = sgs.quantiles(sraster, quantiles=10, compress=1)
+
+    @pytest.mark.parametrize("raster, quantiles", [
+        ("sraster", [-0.000001, 0.2, 0.4, 0.7]),
+        ("sraster", [0.2, 0.4, 0.8, 1.1]),
+        ("mraster", 5),
+        ("sraster", [[0.2, 0.4, 0.8], 5]),
+        ("sraster", []),
+    ])
+    def test_invalid_quantiles_inputs(self, request, raster, quantiles):
         with pytest.raises(ValueError):
-            test_rast = sgs.quantiles(self.single_band_rast, quantiles=[[0.2, 0.4, 0.8], 5])
-        
-        with pytest.raises(ValueError):
-            test_rast = sgs.quantiles(self.single_band_rast, quantiles=[])
-    
-    def test_write_functionality(self, tmp_path):
+            sgs.quantiles(request.getfixturevalue(raster), quantiles=quantiles)
+
+    def test_write_functionality(self, tmp_path, mraster):
         temp_dir = tmp_path / "test_out"
         temp_dir.mkdir()
 
         temp_file = temp_dir / "rast.tif"
-        sgs.quantiles(self.rast, quantiles={'zq90': 4}, filename=str(temp_file))
+        sgs.quantiles(mraster, quantiles={'zq90': 4}, filename=str(temp_file))
+        test_rast = sgs.SpatialRaster(str(temp_file))
+        test = test_rast.band('strat_zq90')
+        assert np.array_equal(test, self.zq90_correct)
+
+        #uncompressed output should contain the same values
+        temp_file = temp_dir / "rast_uncompressed.tif"
+        sgs.quantiles(mraster, quantiles={'zq90': 4}, filename=str(temp_file), compress='none')
+        test_rast = sgs.SpatialRaster(str(temp_file))
+        test = test_rast.band('strat_zq90')
+        assert np.array_equal(test, self.zq90_correct)
+
+        #deflate output should contain the same values
+        temp_file = temp_dir / "rast_deflate.tif"
+        sgs.quantiles(mraster, quantiles={'zq90': 4}, filename=str(temp_file), compress='deflate')
+        test_rast = sgs.SpatialRaster(str(temp_file))
+        test = test_rast.band('strat_zq90')
+        assert np.array_equal(test, self.zq90_correct)
+
+    def test_overviews(self, tmp_path, mraster):
+        gdal = pytest.importorskip("osgeo.gdal")
+
+        #overviews are only built by default for large rasters
+        temp_file = tmp_path / "rast.tif"
+        sgs.quantiles(mraster, quantiles={'zq90': 4}, filename=str(temp_file))
+        assert gdal.Open(str(temp_file)).GetRasterBand(1).GetOverviewCount() == 0
+
+        #levels 2 and 4 are built, the next level would be smaller than 64 pixels
+        temp_file = tmp_path / "rast_overviews.tif"
+        sgs.quantiles(mraster, quantiles={'zq90': 4}, filename=str(temp_file), overviews=True)
+        assert gdal.Open(str(temp_file)).GetRasterBand(1).GetOverviewCount() == 2
+
+        #building overviews should not change the full resolution values
         test_rast = sgs.SpatialRaster(str(temp_file))
         test = test_rast.band('strat_zq90')
-        correct = np.nan_to_num(np.subtract(self.zq90_output_rast.band(0), 1), nan=-1)
-        assert np.array_equal(test, correct, equal_nan=True)
+        assert np.array_equal(test, self.zq90_correct)
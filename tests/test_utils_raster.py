@@ -1,13 +1,13 @@
+import gc
 import pytest
-import sgspy as sgs
 import numpy as np
+import matplotlib
+matplotlib.use("Agg") #draw plots without opening any windows
 import matplotlib.pyplot as plt
+import sgspy as sgs
 
 from files import (
     mraster_geotiff_path,
-    mraster_small_geotiff_path,
-    sraster_geotiff_path,
-    sraster2_geotiff_path,
     mraster_zq90_path,
     mraster_pzabove2_path,
     mraster_zsd_path,
@@ -18,97 +18,135 @@ from files import (
     sraster2_band_path,
 )
 
+#expected properties of each test raster, keyed by the name of its session fixture.
+#floating point values which can't be compared exactly are given as (value, tolerance).
+#the reference band data is memory mapped and loaded once for every test.
+expected_rasters = {
+    'mraster': {
+        'attributes': dict(width=373, height=277, band_count=3, pixel_width=20, pixel_height=20,
+                           xmin=431100, xmax=438560, ymin=5337700, ymax=5343240),
+        'bands': ['zq90', 'pzabove2', 'zsd'],
+        'data': [np.load(path, mmap_mode='r') for path in [mraster_zq90_path, mraster_pzabove2_path, mraster_zsd_path]],
+    },
+    'mraster_small': {
+        'attributes': dict(width=141, height=110, band_count=3, pixel_width=20, pixel_height=20,
+                           xmin=432440, xmax=435260, ymin=5340000, ymax=5342200),
+        'bands': ['zq90', 'pzabove2', 'zsd'],
+        'data': [np.load(path, mmap_mode='r') for path in [mraster_small_zq90_path, mraster_small_pzabove2_path, mraster_small_zsd_path]],
+    },
+    'sraster': {
+        'attributes': dict(width=373, height=277, band_count=1, pixel_width=20, pixel_height=20,
+                           xmin=431100, xmax=438560, ymin=5337700, ymax=5343240),
+        'bands': ['strata'],
+        'data': [np.load(sraster_strata_path, mmap_mode='r')],
+    },
+    'sraster2': {
+        'attributes': dict(width=861, height=611, band_count=1,
+                           pixel_width=(0.0003353943, 1e-10), pixel_height=(0.0003353943, 1e-10),
+                           xmin=(-71.9365, 1e-4), xmax=(-71.64773, 1e-4), ymin=(45.4883, 1e-4), ymax=(45.69332, 1e-4)),
+        'bands': [''],
+        'data': [np.load(sraster2_band_path, mmap_mode='r')],
+    },
+}
+
 class TestSpatialRaster:
-    def mraster_check(self, rast):
-        assert rast.width == 373
-        assert rast.height == 277
-        assert rast.band_count == 3
-        assert rast.pixel_width == 20
-        assert rast.pixel_height == 20
-        assert rast.xmin == 431100
-        assert rast.xmax == 438560
-        assert rast.ymin == 5337700
-        assert rast.ymax == 5343240
-        assert 'zq90' in rast.bands
-        assert 'pzabove2' in rast.bands
-        assert 'zsd' in rast.bands
-        assert len(rast.bands) == 3
-        assert np.array_equal(np.load(mraster_zq90_path), rast.band(0), equal_nan=True)
-        assert np.array_equal(np.load(mraster_pzabove2_path), rast.band(1), equal_nan=True)
-        assert np.array_equal(np.load(mraster_zsd_path), rast.band(2), equal_nan=True)
-
-    def mraster_small_check(self, rast):
-        assert rast.width == 141
-        assert rast.height == 110
-        assert rast.band_count == 3
-        assert rast.pixel_width == 20
-        assert rast.pixel_height == 20
-        assert rast.xmin == 432440
-        assert rast.xmax == 435260
-        assert rast.ymin == 5340000
-        assert rast.ymax == 5342200
-        assert 'zq90' in rast.bands
-        assert 'pzabove2' in rast.bands
-        assert 'zsd' in rast.bands
-        assert len(rast.bands) == 3
-        assert np.array_equal(np.load(mraster_small_zq90_path), rast.band(0), equal_nan=True)
-        assert np.array_equal(np.load(mraster_small_pzabove2_path), rast.band(1), equal_nan=True)
-        assert np.array_equal(np.load(mraster_small_zsd_path), rast.band(2), equal_nan=True)
-    
-    def sraster_check(self, rast):
-        assert rast.width == 373
-        assert rast.height == 277
-        assert rast.band_count == 1
-        assert rast.pixel_width == 20
-        assert rast.pixel_height == 20
-        assert rast.xmin == 431100
-        assert rast.xmax == 438560
-        assert rast.ymin == 5337700
-        assert rast.ymax == 5343240
-        assert 'strata' in rast.bands
-        assert len(rast.bands) == 1
-        assert np.array_equal(np.load(sraster_strata_path), rast.band(0), equal_nan=True)
-
-    def sraster2_check(self, rast):
-        assert rast.width == 861
-        assert rast.height == 611
-        assert rast.band_count == 1
-        assert rast.pixel_width - 0.0003353943 == pytest.approx(0, abs=1e-10)
-        assert rast.pixel_height - 0.0003353943 == pytest.approx(0, abs=1e-10)
-        assert rast.xmin - -71.9365 == pytest.approx(0, abs=1e-4)
-        assert rast.xmax - -71.64773 == pytest.approx(0, abs=1e-4)
-        assert rast.ymin - 45.4883 == pytest.approx(0, abs=1e-4)
-        assert rast.ymax - 45.69332 == pytest.approx(0, abs=1e-4)
-        assert '' in rast.bands
-        assert len(rast.bands) == 1
-        assert np.array_equal(np.load(sraster2_band_path), rast.band(0), equal_nan=True)
-
-    def test_construct_from_path(self):
-        rast = sgs.utils.raster.SpatialRaster(mraster_geotiff_path)
-        self.mraster_check(rast)
+    def check_raster(self, rast, expected):
+        for (attribute, value) in expected['attributes'].items():
+            if type(value) is tuple:
+                (value, tolerance) = value
+                assert abs(getattr(rast, attribute) - value) <= tolerance
+            else:
+                assert getattr(rast, attribute) == value
 
-        rast = sgs.utils.raster.SpatialRaster(mraster_small_geotiff_path)
-        self.mraster_small_check(rast)
+        assert sorted(rast.bands) == sorted(expected['bands'])
+        for (i, data) in enumerate(expected['data']):
+            np.testing.assert_array_equal(rast.band(i), data) #nan values compare equal
 
-        rast = sgs.utils.raster.SpatialRaster(sraster_geotiff_path)
-        self.sraster_check(rast)
+    @pytest.mark.parametrize("name", expected_rasters)
+    def test_construct_from_path(self, request, name):
+        #the session fixtures are constructed from their file paths
+        self.check_raster(request.getfixturevalue(name), expected_rasters[name])
 
-        rast = sgs.utils.raster.SpatialRaster(sraster2_geotiff_path)
-        self.sraster2_check(rast)
+    @pytest.mark.parametrize("name", expected_rasters)
+    def test_construct_from_existing(self, request, name):
+        rast = request.getfixturevalue(name)
+        new_rast = sgs.utils.raster.SpatialRaster(rast.cpp_raster)
+        self.check_raster(new_rast, expected_rasters[name])
 
-    def test_construct_from_existing(self):
+    def test_band_cached(self):
         rast = sgs.utils.raster.SpatialRaster(mraster_geotiff_path)
-        new_rast = sgs.utils.raster.SpatialRaster(rast.cpp_raster)
-        self.mraster_check(new_rast)
+        band = rast.band(0)
 
-        rast = sgs.utils.raster.SpatialRaster(mraster_small_geotiff_path)
-        new_rast = sgs.utils.raster.SpatialRaster(rast.cpp_raster)
-        self.mraster_small_check(new_rast)
+        #repeat reads of a band (by index or name) return the same read-only cached array
+        assert rast.band(0) is band
+        assert rast.band('zq90') is band
+        assert rast.band(0).ctypes.data == band.ctypes.data
+        assert not band.flags.writeable
 
-        rast = sgs.utils.raster.SpatialRaster(sraster_geotiff_path)
-        new_rast = sgs.utils.raster.SpatialRaster(rast.cpp_raster)
-        self.sraster_check(new_rast)
+    def test_plot(self, mraster_small):
+        fig, ax = plt.subplots()
+        try:
+            mraster_small.plot(ax=ax, band=0)
+            mraster_small.plot(ax=ax, band='zsd', target_width=50, target_height=50)
+            assert len(ax.images) == 2
+        finally:
+            plt.close(fig)
 
-        rast = sgs.utils.raster.SpatialRaster(sraster2_geotiff_path)
-        new_rast = sgs.utils.raster.SpatialRaster(rast.cpp_raster)
-        self.sraster2_check(new_rast) 
+    @pytest.mark.parametrize("band, exception", [
+        (None, ValueError), #band is required for a multi-band raster
+        (0.5, TypeError),
+        ((0, 1, 2), TypeError),
+        ('red', ValueError), #not a band name
+    ])
+    def test_plot_invalid_band(self, mraster_small, band, exception):
+        fig, ax = plt.subplots()
+        try:
+            with pytest.raises(exception):
+                mraster_small.plot(ax=ax, band=band)
+        finally:
+            plt.close(fig)
+
+class TestConversion:
+    #each conversion goes through an in-memory raster built from the file's data,
+    #and the result is checked after every other reference to that data is dropped.
+
+    def test_gdal_round_trip(self):
+        gdal = pytest.importorskip("osgeo.gdal")
+        correct = gdal.Open(mraster_geotiff_path).ReadAsArray()
+
+        src = gdal.Open(mraster_geotiff_path)
+        rast = sgs.utils.raster.SpatialRaster.from_gdal(src, src.ReadAsArray())
+        ds, arr = rast.to_gdal(with_arr=True)
+        del rast
+        gc.collect()
+
+        np.testing.assert_array_equal(ds.ReadAsArray(), correct)
+        np.testing.assert_array_equal(arr, correct)
+
+        #converting the MEM dataset back reads its data into a new in-memory raster
+        rast = sgs.utils.raster.SpatialRaster.from_gdal(ds)
+        del ds
+        gc.collect()
+        for i in range(3):
+            np.testing.assert_array_equal(rast.band(i), correct[i])
+
+    def test_gdal_from_file(self):
+        gdal = pytest.importorskip("osgeo.gdal")
+        correct = gdal.Open(mraster_geotiff_path).ReadAsArray()
+
+        ds = sgs.utils.raster.SpatialRaster(mraster_geotiff_path).to_gdal()
+        np.testing.assert_array_equal(ds.ReadAsArray(), correct)
+
+    def test_rasterio_round_trip(self):
+        rasterio = pytest.importorskip("rasterio")
+        with rasterio.open(mraster_geotiff_path) as src:
+            correct = src.read()
+
+        rast = sgs.utils.raster.SpatialRaster.from_rasterio(rasterio.open(mraster_geotiff_path), correct.copy())
+        ds, arr = rast.to_rasterio(with_arr=True)
+        del rast
+        gc.collect()
+
+        np.testing.assert_array_equal(ds.read(), correct)
+        np.testing.assert_array_equal(arr, correct)
+        ds.close()
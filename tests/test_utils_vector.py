@@ -1,61 +1,49 @@
+from operator import itemgetter
+
 import pytest
+import numpy as np
 import sgspy as sgs
 
 from files import (
-    access_shapefile_path,
-    existing_shapefile_path,
     existing_geodatabase_path,
     existing_geojson_path,
-    inventory_polygons_shapefile_path,
 )
 
+#expected properties of the single layer in each test vector, keyed by the name of its session fixture.
+#extents are given as (xmin, xmax, ymin, ymax)
+expected_vectors = {
+    'access_vect': dict(layer='access', feature_count=167, field_count=2, geometry_type="Line String",
+                        extent=(431100, 438560, 5337700, 5343240)),
+    'existing_vect': dict(layer='existing', feature_count=200, field_count=1, geometry_type="Point",
+                          extent=(431110, 438530, 5337710, 5343230)),
+    'inventory_vect': dict(layer='inventory_polygons', feature_count=632, field_count=3, geometry_type="Polygon",
+                           extent=(431100, 438560, 5337700, 5343240)),
+}
+
+#the layer info values which are checked, fetched from the layer info dict in one call
+get_layer_info_values = itemgetter("feature_count", "field_count", "geometry_type", "xmin", "xmax", "ymin", "ymax")
+
 class TestSpatialVector:
-    def access_parameters_check(self, vec):
+    def check_vector(self, vec, expected):
         assert len(vec.layers) == 1
-        assert vec.layers[0] == 'access'
-        layer_info = vec.cpp_vector.get_layer_info('access')
-        assert int(layer_info["feature_count"]) == 167
-        assert int(layer_info["field_count"]) == 2
-        assert layer_info["geometry_type"] == "Line String"
-        assert float(layer_info["xmin"]) == 431100
-        assert float(layer_info["xmax"]) == 438560
-        assert float(layer_info["ymin"]) == 5337700
-        assert float(layer_info["ymax"]) == 5343240
-
-    def existing_parameters_check(self, vec):
-        assert len(vec.layers) == 1
-        assert vec.layers[0] == 'existing'
-        layer_info = vec.cpp_vector.get_layer_info('existing')
-        assert int(layer_info["feature_count"]) == 200
-        assert int(layer_info["field_count"]) == 1
-        assert layer_info["geometry_type"] == "Point"
-        assert float(layer_info["xmin"]) == 431110
-        assert float(layer_info["xmax"]) == 438530
-        assert float(layer_info["ymin"]) == 5337710
-        assert float(layer_info["ymax"]) == 5343230
-
-    def inventory_polygons_parameters_check(self, vec):
-        assert len(vec.layers) == 1
-        assert vec.layers[0] == 'inventory_polygons'
-        layer_info = vec.cpp_vector.get_layer_info('inventory_polygons')
-        assert int(layer_info["feature_count"]) == 632
-        assert int(layer_info["field_count"]) == 3
-        assert layer_info["geometry_type"] == "Polygon"
-        assert float(layer_info["xmin"]) == 431100
-        assert float(layer_info["xmax"]) == 438560
-        assert float(layer_info["ymin"]) == 5337700
-        assert float(layer_info["ymax"]) == 5343240
-
-    def test_construct_from_path(self):
-        vec = sgs.utils.vector.SpatialVector(access_shapefile_path)
-        self.access_parameters_check(vec)
-
-        vec = sgs.utils.vector.SpatialVector(existing_shapefile_path)
-        self.existing_parameters_check(vec)
-
-        vec = sgs.utils.vector.SpatialVector(inventory_polygons_shapefile_path)
-        self.inventory_polygons_parameters_check(vec)
+        assert vec.layers[0] == expected['layer']
+        layer_info = vec.cpp_vector.get_layer_info(expected['layer'])
+        (feature_count, field_count, geometry_type, xmin, xmax, ymin, ymax) = get_layer_info_values(layer_info)
+        assert int(feature_count) == expected['feature_count']
+        assert int(field_count) == expected['field_count']
+        assert geometry_type == expected['geometry_type']
+        extent = np.array([xmin, xmax, ymin, ymax], dtype=np.float64)
+        np.testing.assert_array_equal(extent, expected['extent'])
+
+    @pytest.mark.parametrize("name", expected_vectors)
+    def test_construct_from_path(self, request, name):
+        #the session fixtures are constructed from their file paths
+        self.check_vector(request.getfixturevalue(name), expected_vectors[name])
 
     def test_geojson_format(self):
         vec = sgs.utils.vector.SpatialVector(existing_geojson_path)
-        self.existing_parameters_check(vec)
+        self.check_vector(vec, expected_vectors['existing_vect'])
+
+    def test_samples_as_xy_without_samples_layer(self, existing_vect):
+        with pytest.raises(ValueError):
+            existing_vect.samples_as_xy()